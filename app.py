@@ -1,16 +1,106 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, url_for, Response, stream_with_context, g
+from flask import has_request_context, before_render_template, template_rendered
+from werkzeug.http import is_resource_modified
 import pickle
+import sys
+import csv
+import zlib
+import click
 import os
-from datetime import datetime
+import json
+import time
+import hashlib
+import hmac
+import re
+import threading
+import functools
+import contextlib
+import cProfile
+import pstats
+import tempfile
+import shutil
+import itertools
+import mmap
+import struct
+import multiprocessing
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+import numpy as np
 import pandas as pd
-import matplotlib
-matplotlib.use('Agg')  # Backend non-interactif
-import matplotlib.pyplot as plt
+# Compression brotli des réponses si le module est installé (sinon gzip uniquement)
+try:
+    import brotli
+except ImportError:
+    brotli = None
+import gzip
+# Rendu des figures par l'API objet de matplotlib (sans pyplot ni gestionnaire global de figures)
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import base64
 import io
 
 app = Flask(__name__)
 
+# Configuration (surchargeable par variables d'environnement)
+# Nombre de figures gardées en mémoire et répertoire optionnel du cache disque partagé
+app.config['FIGURE_CACHE_SIZE'] = int(os.environ.get('FIGURE_CACHE_SIZE', 128))
+app.config['FIGURE_CACHE_DIR'] = os.environ.get('FIGURE_CACHE_DIR') or None
+app.config['FIGURE_CACHE_DISK_SIZE'] = int(os.environ.get('FIGURE_CACHE_DISK_SIZE', 512))
+# Nombre de processus de rendu du tableau de bord (0 ou 1 : rendu sur le thread de la requête)
+app.config['DASHBOARD_WORKERS'] = int(os.environ.get('DASHBOARD_WORKERS', 0))
+# Images du tableau de bord : 'url' (servies par /api/plot), 'inline' (base64 dans la page) ou 'client'
+# (dessinées en SVG par le navigateur depuis /api/series) ; ?mode= sur /dashboard remplace ce réglage
+app.config['DASHBOARD_IMAGE_MODE'] = os.environ.get('DASHBOARD_IMAGE_MODE', 'url')
+# Format des images du tableau de bord en modes 'url' et 'inline' : png, svg, svgz ou webp
+# (en mode 'inline', svgz est intégré en SVG non compressé)
+app.config['DASHBOARD_IMAGE_FORMAT'] = os.environ.get('DASHBOARD_IMAGE_FORMAT', 'png')
+# Figures libres gardées par gabarit pour être réutilisées (au moins 1 ; de l'ordre du nombre de rendus simultanés)
+app.config['FIGURE_POOL_SIZE'] = int(os.environ.get('FIGURE_POOL_SIZE', max(2, os.cpu_count() or 1)))
+# Durée (secondes) pendant laquelle le navigateur réutilise une image sans la revalider
+app.config['PLOT_CACHE_MAX_AGE'] = int(os.environ.get('PLOT_CACHE_MAX_AGE', 60))
+# Répertoire des modèles servis (vide : racine du projet ; ex. une version produite par train-models)
+app.config['MODEL_DIR'] = os.environ.get('MODEL_DIR', '')
+# Rechargement des modèles et des données quand leurs fichiers changent :
+# 'auto' (vérifié à chaque accès, la requête qui le constate recharge) ou 'managed' (rechargés en
+# arrière-plan puis substitués, par la surveillance toutes les RELOAD_INTERVAL secondes ou POST /admin/reload)
+app.config['RELOAD_MODE'] = os.environ.get('RELOAD_MODE', 'auto')
+app.config['RELOAD_INTERVAL'] = float(os.environ.get('RELOAD_INTERVAL', 5))
+# Traitements lourds (rendu des figures, prévisions calculées, export) : nombre exécutés en parallèle
+# (0 : pas de limite), nombre de requêtes en attente au-delà duquel la réponse est 503, attente maximale
+app.config['HEAVY_WORKERS'] = int(os.environ.get('HEAVY_WORKERS', max(2, os.cpu_count() or 1)))
+app.config['HEAVY_QUEUE_DEPTH'] = int(os.environ.get('HEAVY_QUEUE_DEPTH', 8))
+app.config['HEAVY_QUEUE_TIMEOUT'] = float(os.environ.get('HEAVY_QUEUE_TIMEOUT', 10))
+app.config['RETRY_AFTER'] = int(os.environ.get('RETRY_AFTER', 5))
+# Taille (octets) à partir de laquelle les réponses JSON dynamiques sont compressées (0 : jamais)
+app.config['COMPRESS_MIN_SIZE'] = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+# Jeton exigé par les routes /admin (en-tête X-Admin-Token) ; vide : accès local uniquement
+app.config['ADMIN_TOKEN'] = os.environ.get('ADMIN_TOKEN', '')
+# Format des modèles chargés : 'pickle' (sarima_*.pkl) ou 'compact' (sarima_*.npz s'il existe)
+app.config['MODEL_FORMAT'] = os.environ.get('MODEL_FORMAT', 'pickle')
+# Moteur de calcul de la table de prévisions : 'statsmodels' (get_forecast) ou 'numpy'
+app.config['FORECAST_ENGINE'] = os.environ.get('FORECAST_ENGINE', 'statsmodels')
+# Préchargement des modèles et des données au démarrage (désactivé par défaut en développement)
+app.config['WARMUP_ON_START'] = os.environ.get('WARMUP_ON_START', '0') == '1'
+app.config['WARMUP_WORKERS'] = int(os.environ.get('WARMUP_WORKERS', 4))
+# Service en pré-fork (positionné par serve.py) : les tâches d'arrière-plan sont lancées dans chaque
+# processus de service après le fork, pas à l'import dans le processus maître
+app.config['PREFORK'] = os.environ.get('PREFORK', '0') == '1'
+# Répertoire du cache colonnaire des données Excel (vide : lecture directe du classeur)
+app.config['DATA_CACHE_DIR'] = os.environ.get('DATA_CACHE_DIR', '.cache')
+# Magasin des séries (historique, valeurs ajustées, prévisions) mappé en mémoire et partagé par tous
+# les processus (vide : désactivé ; construit par `flask --app app build-series-store` ou serve.py)
+app.config['SERIES_STORE'] = os.environ.get('SERIES_STORE', '')
+# Mesure des temps par étape exposée sur /metrics (activée par défaut)
+app.config['METRICS_ENABLED'] = os.environ.get('METRICS_ENABLED', '1') == '1'
+# Profilage à la demande (en-tête X-Profile ou ?profile=summary|save), désactivé par défaut
+app.config['PROFILING_ENABLED'] = os.environ.get('PROFILING_ENABLED', '0') == '1'
+app.config['PROFILE_DIR'] = os.environ.get('PROFILE_DIR', 'profiles')
+app.config['PROFILE_TOP'] = int(os.environ.get('PROFILE_TOP', 30))
+
+# Fichier de données Excel
+DATA_FILE = 'Taux de chômage_Maroc-Dataset.xlsx'
+
 # Noms des trimestres
 quarter_names = {1: 'T1', 2: 'T2', 3: 'T3', 4: 'T4'}
 
@@ -102,130 +192,850 @@ CATEGORY_HIERARCHY = {
 # Mapping plat pour compatibilité (catégorie finale -> modèle)
 CATEGORY_MODELS = {}
 CATEGORY_COLORS = {}
+# Colonne Excel de chaque catégorie qui en a une
+CATEGORY_EXCEL_COLUMNS = {}
 for main_cat, info in CATEGORY_HIERARCHY.items():
     if info['model']:
         CATEGORY_MODELS[main_cat] = info['model']
         CATEGORY_COLORS[main_cat] = info.get('color', '#C1272D')
+        if info.get('excel_column'):
+            CATEGORY_EXCEL_COLUMNS[main_cat] = info['excel_column']
     if info['subcategories']:
         for sub_cat, sub_info in info['subcategories'].items():
             CATEGORY_MODELS[sub_cat] = sub_info['model']
             CATEGORY_COLORS[sub_cat] = sub_info.get('color', '#C1272D')
+            if sub_info.get('excel_column'):
+                CATEGORY_EXCEL_COLUMNS[sub_cat] = sub_info['excel_column']
+
+# Bornes (secondes) des histogrammes de latence
+METRICS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Histogramme cumulatif au format Prometheus, une série par combinaison de labels (thread-safe)"""
+    
+    def __init__(self, name, documentation, labelnames, buckets=METRICS_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self.series = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value, *labels):
+        """Enregistre une durée (secondes) pour les valeurs de labels données, dans l'ordre de labelnames"""
+        with self._lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+    
+    def render(self):
+        """Lignes du format texte Prometheus"""
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = [(labels, list(counts), total, count) for labels, (counts, total, count) in self.series.items()]
+        for labels, counts, total, count in sorted(series):
+            base = ','.join(f'{name}="{_escape_label(value)}"' for name, value in zip(self.labelnames, labels))
+            prefix = base + ',' if base else ''
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {bucket_count}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {count}')
+            lines.append(f'{self.name}_sum{{{base}}} {total}')
+            lines.append(f'{self.name}_count{{{base}}} {count}')
+        return lines
+
+
+def _escape_label(value):
+    """Échappe une valeur de label Prometheus"""
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+# Temps par étape (chargement des modèles et des données, prévision, rendu et encodage des figures,
+# rendu des gabarits), labellisés par route Flask et par catégorie ; les étapes peuvent s'imbriquer
+stage_histogram = Histogram('app_stage_duration_seconds', "Durée d'une étape de traitement",
+                            ('stage', 'route', 'category'))
+request_histogram = Histogram('app_request_duration_seconds', 'Durée de traitement des requêtes HTTP',
+                              ('route', 'method', 'status'))
+
+# Catégorie de l'étape en cours, héritée par les étapes imbriquées
+_metrics_context = threading.local()
+
+
+def current_route():
+    """Route Flask de la requête en cours ('none' hors requête, ex. préchargement)"""
+    if has_request_context():
+        return request.endpoint or 'none'
+    return 'none'
+
 
-# Cache pour les modèles chargés
-loaded_models = {}
+def observe_stage(stage, seconds, category=None):
+    """Enregistre la durée d'une étape déjà mesurée"""
+    if category is None:
+        category = getattr(_metrics_context, 'category', None)
+    stage_histogram.observe(seconds, stage, current_route(), category or '')
 
-# Cache pour les données Excel
-df_data = None
 
+@contextlib.contextmanager
+def stage_timer(stage, category=None):
+    """Mesure la durée du bloc et l'enregistre dans stage_histogram (catégorie héritée si absente)"""
+    if not app.config['METRICS_ENABLED']:
+        yield
+        return
+    
+    previous = getattr(_metrics_context, 'category', None)
+    if category is None:
+        category = previous
+    _metrics_context.category = category
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _metrics_context.category = previous
+        stage_histogram.observe(time.perf_counter() - start, stage, current_route(), category or '')
 
-def load_model(category):
-    """Charge un modèle depuis le cache ou depuis le fichier"""
-    if category in loaded_models:
-        return loaded_models[category]
+
+class SingleFlightCache:
+    """
+    Cache thread-safe clé -> (version, valeur) à chargement unique : quand une valeur manque
+    ou n'est plus à jour, un seul thread la charge et les autres attendent son résultat.
+    """
+    
+    def __init__(self):
+        self.entries = {}
+        self.stats = {'hits': 0, 'misses': 0, 'waits': 0}
+        self._lock = threading.Lock()
+        self._inflight = {}
+    
+    def get(self, key, version, loader):
+        """Retourne la valeur de `key` pour `version`, en appelant loader() si nécessaire"""
+        while True:
+            with self._lock:
+                entry = self.entries.get(key)
+                if entry is not None and entry[0] == version:
+                    self.stats['hits'] += 1
+                    return entry[1]
+                
+                event = self._inflight.get(key)
+                if event is None:
+                    event = threading.Event()
+                    self._inflight[key] = event
+                    self.stats['misses'] += 1
+                    break
+                self.stats['waits'] += 1
+            
+            # Un autre thread charge déjà cette clé : attendre puis relire le cache
+            event.wait()
+        
+        try:
+            value = loader()
+            with self._lock:
+                self.entries[key] = (version, value)
+            return value
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            event.set()
+    
+    def version(self, key):
+        """Version actuellement en cache pour `key` (None si absente)"""
+        with self._lock:
+            entry = self.entries.get(key)
+        return entry[0] if entry is not None else None
+    
+    def put(self, key, version, value):
+        """Remplace atomiquement la valeur de `key` (les lecteurs voient l'ancienne ou la nouvelle entrée)"""
+        with self._lock:
+            self.entries[key] = (version, value)
     
+    def discard(self, key):
+        """Supprime l'entrée de `key` si elle existe"""
+        with self._lock:
+            self.entries.pop(key, None)
+    
+    def snapshot(self):
+        """Copie des compteurs de succès, d'échecs et d'attentes"""
+        with self._lock:
+            return dict(self.stats, size=len(self.entries))
+
+
+# Cache des modèles chargés : catégorie -> (empreinte du fichier, modèle)
+model_cache = SingleFlightCache()
+
+# Cache des données Excel : 'data' -> (empreinte du fichier, DataFrame)
+data_cache = SingleFlightCache()
+
+# Empreintes des fichiers : chemin -> ((mtime_ns, taille), empreinte)
+fingerprint_cache = SingleFlightCache()
+
+
+def _hash_file(path):
+    """Empreinte SHA-256 (tronquée) du contenu d'un fichier"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def file_fingerprint(path):
+    """Retourne l'empreinte SHA-256 (tronquée) d'un fichier, recalculée uniquement si le fichier change"""
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    return fingerprint_cache.get(path, stamp, lambda: _hash_file(path))
+
+
+def get_model_file(category):
+    """Chemin du fichier sarima_*.pkl d'une catégorie dans le répertoire des modèles servis"""
+    return os.path.join(app.config['MODEL_DIR'], CATEGORY_MODELS[category])
+
+
+def get_model_path(category):
+    """Chemin du fichier modèle d'une catégorie (artefact compact si configuré et disponible)"""
+    model_path = get_model_file(category)
+    if app.config['MODEL_FORMAT'] == 'compact':
+        compact_path = get_compact_model_path(model_path)
+        if os.path.exists(compact_path):
+            return compact_path
+    return model_path
+
+
+def get_model_version(category):
+    """
+    Retourne la version (empreinte du fichier) du modèle d'une catégorie. En mode 'managed', c'est la
+    version chargée, qui ne change qu'au rechargement en arrière-plan.
+    """
     if category not in CATEGORY_MODELS:
         raise ValueError(f"Catégorie '{category}' non trouvée")
     
-    model_path = CATEGORY_MODELS[category]
+    if app.config['RELOAD_MODE'] == 'managed':
+        version = model_cache.version(category)
+        if version is not None:
+            return version
+    
+    model_path = get_model_path(category)
     
     if not os.path.exists(model_path):
         raise FileNotFoundError(f"Modèle '{model_path}' non trouvé")
     
-    with open(model_path, 'rb') as f:
-        model = pickle.load(f)
-    
-    loaded_models[category] = model
+    return file_fingerprint(model_path)
+
+
+def load_model(category, version=None):
+    """
+    Charge un modèle depuis le cache ou depuis le fichier (rechargé si le fichier a changé).
+    version : version attendue (celle d'une valeur dérivée du modèle), par défaut la version actuelle.
+    """
+    if version is None:
+        version = get_model_version(category)
+    return model_cache.get(category, version, lambda: _load_model_file(category, version))
+
+
+def read_model_file(category):
+    """Lit le fichier modèle d'une catégorie (pickle ou artefact compact), sans le mettre en cache"""
+    model_path = get_model_path(category)
+    with stage_timer('model_load', category):
+        if model_path.endswith('.npz'):
+            return load_compact_model(model_path)
+        with open(model_path, 'rb') as f:
+            return pickle.load(f)
+
+
+def _load_model_file(category, version):
+    """Lit le fichier modèle d'une catégorie et précalcule sa ligne de la table de prévisions"""
+    # Désérialisation et précalcul : un traitement lourd, borné par le limiteur (premier accès à froid)
+    with heavy_slot():
+        model = read_model_file(category)
+        
+        # Précalculer la trajectoire des prévisions dès le chargement du modèle
+        try:
+            fill_forecast_row(category, model, version)
+        except Exception as e:
+            print(f"Erreur de précalcul des prévisions pour {category}: {str(e)}")
     return model
 
 
+# Format compact des modèles : ordres, paramètres, état final et valeurs ajustées dans un .npz
+COMPACT_MODEL_FORMAT_VERSION = 1
+
+# Options de SARIMAX nécessaires pour reconstruire les matrices de l'espace d'états
+COMPACT_MODEL_SPEC_KEYS = [
+    'order', 'seasonal_order', 'trend', 'measurement_error', 'time_varying_regression',
+    'mle_regression', 'simple_differencing', 'enforce_stationarity', 'enforce_invertibility',
+    'hamilton_representation', 'concentrate_scale', 'trend_offset'
+]
+
+
+def get_compact_model_path(model_path):
+    """Chemin de l'artefact compact correspondant à un fichier sarima_*.pkl"""
+    return os.path.splitext(model_path)[0] + '.npz'
+
+
+class CompactForecast:
+    """Résultat de prévision d'un modèle compact (mêmes attributs utiles que statsmodels)"""
+    
+    def __init__(self, predicted_mean, var_pred_mean):
+        self.predicted_mean = predicted_mean
+        self.var_pred_mean = var_pred_mean
+        self.se_mean = np.sqrt(var_pred_mean)
+    
+    def conf_int(self, alpha=0.05):
+        """Intervalle de confiance (bornes inférieure et supérieure par trimestre)"""
+        from scipy.stats import norm
+        q = norm.ppf(1 - alpha / 2)
+        return np.column_stack([self.predicted_mean - q * self.se_mean,
+                                self.predicted_mean + q * self.se_mean])
+
+
+class CompactSarimaResults:
+    """Modèle SARIMA reconstruit depuis un artefact compact, prévisions identiques à statsmodels"""
+    
+    def __init__(self, spec, params, state, state_cov, nobs, scale, fittedvalues):
+        from statsmodels.tsa.statespace.sarimax import SARIMAX
+        
+        # Les matrices de l'espace d'états ne dépendent que des ordres et des paramètres
+        model = SARIMAX(np.zeros(nobs), **spec)
+        model.update(params)
+        ssm = model.ssm
+        self.transition = np.array(ssm['transition'])
+        self.design = np.array(ssm['design'])
+        self.obs_intercept = np.array(ssm['obs_intercept'])
+        self.state_intercept = np.array(ssm['state_intercept'])
+        self.obs_cov = np.array(ssm['obs_cov'])
+        self.state_cov_term = ssm['selection'] @ ssm['state_cov'] @ ssm['selection'].T
+        
+        self.spec = spec
+        self.params = params
+        self.state = state
+        self.state_cov = state_cov
+        self.nobs = nobs
+        self.scale = scale
+        self.fittedvalues = fittedvalues
+    
+    def get_forecast(self, steps=1):
+        """Prévisions hors échantillon par récurrence de Kalman depuis l'état final"""
+        state = self.state
+        state_cov = self.state_cov
+        mean = np.empty(steps)
+        var = np.empty(steps)
+        for h in range(steps):
+            mean[h] = (self.design @ state + self.obs_intercept)[0]
+            var[h] = (self.design @ state_cov @ self.design.T + self.obs_cov)[0, 0]
+            state = self.transition @ state + self.state_intercept
+            state_cov = self.transition @ state_cov @ self.transition.T + self.state_cov_term
+        return CompactForecast(mean, var * self.scale)
+    
+    def forecast(self, steps=1):
+        """Prévisions ponctuelles hors échantillon"""
+        return self.get_forecast(steps).predicted_mean
+
+
+def export_compact_model(results, path):
+    """Écrit l'artefact compact d'un modèle SARIMAX de statsmodels (écriture atomique)"""
+    if results.model.k_exog:
+        raise ValueError("Les modèles avec variables exogènes ne sont pas supportés par le format compact")
+    
+    init_kwds = results.model._get_init_kwds()
+    spec = {key: init_kwds[key] for key in COMPACT_MODEL_SPEC_KEYS}
+    
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez_compressed(
+            f,
+            format_version=np.array(COMPACT_MODEL_FORMAT_VERSION),
+            spec=np.array(json.dumps(spec)),
+            params=np.asarray(results.params, dtype=float),
+            state=np.asarray(results.predicted_state[:, -1], dtype=float),
+            state_cov=np.asarray(results.predicted_state_cov[:, :, -1], dtype=float),
+            nobs=np.array(results.nobs),
+            scale=np.array(float(results.filter_results.scale)),
+            fittedvalues=np.asarray(results.fittedvalues, dtype=float)
+        )
+    os.replace(tmp_path, path)
+
+
+def write_model_file(results, path):
+    """Écrit un modèle au format pickle (écriture atomique : les lecteurs voient l'ancien ou le nouveau fichier)"""
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_compact_model(path):
+    """Charge un artefact compact et reconstruit un modèle capable de prévoir"""
+    with np.load(path, allow_pickle=False) as data:
+        version = int(data['format_version'])
+        if version != COMPACT_MODEL_FORMAT_VERSION:
+            raise ValueError(f"Version d'artefact compact non supportée ({version}) pour '{path}'")
+        
+        spec = json.loads(str(data['spec']))
+        for key in ('order', 'seasonal_order'):
+            spec[key] = tuple(spec[key])
+        
+        return CompactSarimaResults(
+            spec=spec,
+            params=data['params'],
+            state=data['state'],
+            state_cov=data['state_cov'],
+            nobs=int(data['nobs']),
+            scale=float(data['scale']),
+            fittedvalues=data['fittedvalues']
+        )
+
+
 def load_data():
-    """Charge les données Excel en cache"""
-    global df_data
-    if df_data is None:
-        df_data = pd.read_excel('Taux de chômage_Maroc-Dataset.xlsx')
-        # Trier par trimestre
-        if 'Trimestre' in df_data.columns:
-            df_data = df_data.sort_values('Trimestre')
-    return df_data
-
-
-def get_model_fitted_values(category_name):
-    """Récupère les valeurs ajustées du modèle SARIMA pour une catégorie"""
-    try:
-        model = load_model(category_name)
-        fitted = None
-        
-        # Essayer différentes méthodes pour obtenir les fitted values
-        if hasattr(model, 'fittedvalues'):
-            fitted = model.fittedvalues
-        elif hasattr(model, 'fitted_values'):
-            fitted = model.fitted_values
-        elif hasattr(model, 'predict'):
+    """Charge les données Excel en cache (rechargées si le fichier a changé)"""
+    version = get_data_version()
+    return data_cache.get('data', version, lambda: _read_data_file(version))
+
+
+def get_data_cache_path(version):
+    """Chemin du cache colonnaire correspondant à une version du classeur (None si désactivé)"""
+    cache_dir = app.config['DATA_CACHE_DIR']
+    if not cache_dir:
+        return None
+    return os.path.join(cache_dir, f"dataset-{version}.npy")
+
+
+def _import_workbook():
+    """Lit et trie les données du classeur Excel"""
+    df = pd.read_excel(DATA_FILE)
+    # Trier par trimestre
+    if 'Trimestre' in df.columns:
+        df = df.sort_values('Trimestre')
+    return df.reset_index(drop=True)
+
+
+def write_data_cache(df, path):
+    """Écrit les données dans un tableau structuré NumPy (une colonne par champ), écriture atomique"""
+    fields = []
+    for column in df.columns:
+        if df[column].dtype == object:
+            width = max(1, int(df[column].astype(str).str.len().max()))
+            fields.append((column, f'U{width}'))
+        else:
+            fields.append((column, df[column].dtype.str))
+    
+    table = np.empty(len(df), dtype=fields)
+    for column in df.columns:
+        table[column] = df[column].to_numpy()
+    
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, table)
+    os.replace(tmp_path, path)
+    
+    # Supprimer les caches des versions précédentes du classeur
+    for entry in os.scandir(os.path.dirname(path)):
+        if entry.name.startswith('dataset-') and entry.name.endswith('.npy') and entry.path != path:
+            os.remove(entry.path)
+
+
+def read_data_cache(path):
+    """Lit le cache colonnaire (mappé en mémoire) sous forme de DataFrame"""
+    table = np.load(path, mmap_mode='r')
+    return pd.DataFrame({name: np.asarray(table[name]) for name in table.dtype.names})
+
+
+def _read_data_file(version):
+    """Lit les données depuis le cache colonnaire, ou importe le classeur si sa version a changé"""
+    with stage_timer('data_load'):
+        cache_path = get_data_cache_path(version)
+        if cache_path and os.path.exists(cache_path):
             try:
-                # Essayer de prédire sur les données d'entraînement
-                fitted = model.predict()
-            except:
-                try:
-                    # Essayer avec start et end
-                    fitted = model.predict(start=0)
-                except:
-                    pass
+                return read_data_cache(cache_path)
+            except Exception as e:
+                print(f"Erreur de lecture du cache de données {cache_path}: {str(e)}")
         
-        if fitted is None:
+        df = _import_workbook()
+        if cache_path:
+            try:
+                write_data_cache(df, cache_path)
+            except OSError as e:
+                print(f"Erreur d'écriture du cache de données {cache_path}: {str(e)}")
+        return df
+
+
+def get_data_version():
+    """Retourne la version (empreinte du fichier) des données Excel (en mode 'managed' : la version chargée)"""
+    if app.config['RELOAD_MODE'] == 'managed':
+        version = data_cache.version('data')
+        if version is not None:
+            return version
+    return file_fingerprint(DATA_FILE)
+
+
+# Cache des figures rendues : niveau mémoire LRU (clé -> image base64) et niveau disque optionnel (PNG)
+figure_cache = OrderedDict()
+figure_cache_stats = {'hits': 0, 'misses': 0}
+_figure_cache_lock = threading.Lock()
+
+
+def _model_version_or_none(category):
+    """Version du modèle d'une catégorie, ou None s'il est absent"""
+    try:
+        return get_model_version(category)
+    except (ValueError, FileNotFoundError):
+        return None
+
+
+def figure_cache_key(kind, args, kwargs=None, model_scope=None):
+    """Construit la clé d'une figure à partir de ses paramètres et des versions de ses fichiers sources"""
+    # Le format et la résolution par défaut (PNG, 100 dpi) font partie de la clé, qu'ils soient passés explicitement ou non
+    kwargs = {'fmt': 'png', 'dpi': PLOT_DEFAULT_DPI, **(kwargs or {})}
+    parts = [kind, repr(args), repr(sorted(kwargs.items())), get_data_version()]
+    if model_scope == 'category':
+        parts.append(_model_version_or_none(args[0]))
+    elif model_scope == 'all':
+        parts.extend(_model_version_or_none(category) for category in CATEGORY_MODELS)
+    return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+
+
+def _figure_cache_path(key):
+    """Chemin du fichier d'une figure dans le cache disque (None si désactivé)"""
+    cache_dir = app.config['FIGURE_CACHE_DIR']
+    if not cache_dir:
+        return None
+    return os.path.join(cache_dir, f"{key}.fig")
+
+
+def _figure_cache_remember(key, image):
+    """Ajoute une figure au niveau mémoire en évinçant les moins récemment utilisées"""
+    with _figure_cache_lock:
+        figure_cache[key] = image
+        figure_cache.move_to_end(key)
+        while len(figure_cache) > app.config['FIGURE_CACHE_SIZE']:
+            figure_cache.popitem(last=False)
+
+
+def figure_cache_get(key):
+    """Cherche une figure dans le cache mémoire puis dans le cache disque"""
+    image = _figure_cache_lookup(key)
+    with _figure_cache_lock:
+        figure_cache_stats['hits' if image is not None else 'misses'] += 1
+    return image
+
+
+def _figure_cache_lookup(key):
+    """Figure du niveau mémoire, sinon du niveau disque (None si absente)"""
+    with _figure_cache_lock:
+        if key in figure_cache:
+            figure_cache.move_to_end(key)
+            return figure_cache[key]
+    
+    path = _figure_cache_path(key)
+    if path and os.path.exists(path):
+        try:
+            with open(path, 'rb') as f:
+                image = base64.b64encode(f.read()).decode('utf-8')
+            # Marquer la figure comme récemment utilisée pour l'éviction du cache disque
+            os.utime(path)
+        except OSError:
             return None
-        
-        # Convertir en array numpy si nécessaire
-        if hasattr(fitted, 'values'):
-            fitted_values = fitted.values
-        elif hasattr(fitted, 'iloc'):
-            fitted_values = fitted.iloc[:].values
-        elif isinstance(fitted, (list, tuple)):
-            fitted_values = pd.Series(fitted).values
-        else:
+        _figure_cache_remember(key, image)
+        return image
+    return None
+
+
+def figure_cache_put(key, image):
+    """Enregistre une figure dans le cache mémoire et, si configuré, sur disque (écriture atomique)"""
+    _figure_cache_remember(key, image)
+    
+    path = _figure_cache_path(key)
+    if path:
+        tmp_name = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), prefix='.tmp-', delete=False) as tmp:
+                tmp_name = tmp.name
+                tmp.write(base64.b64decode(image))
+            os.replace(tmp_name, path)
+        except OSError as e:
+            print(f"Erreur d'écriture du cache de figures {path}: {str(e)}")
+            if tmp_name and os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            return
+        _prune_figure_disk_cache(os.path.dirname(path))
+
+
+def _prune_figure_disk_cache(cache_dir):
+    """Supprime les figures les moins récemment utilisées au-delà de FIGURE_CACHE_DISK_SIZE fichiers"""
+    try:
+        entries = [entry for entry in os.scandir(cache_dir)
+                   if entry.name.endswith('.fig') and not entry.name.startswith('.tmp-')]
+        excess = len(entries) - app.config['FIGURE_CACHE_DISK_SIZE']
+        if excess <= 0:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+        for entry in entries[:excess]:
+            os.remove(entry.path)
+    except OSError as e:
+        print(f"Erreur de nettoyage du cache de figures {cache_dir}: {str(e)}")
+
+
+def clear_figure_cache():
+    """Vide le niveau mémoire du cache de figures"""
+    with _figure_cache_lock:
+        figure_cache.clear()
+
+
+def cached_figure(kind, model_scope=None):
+    """
+    Décorateur : met en cache le résultat d'une fonction generate_*.
+    model_scope indique les modèles dont dépend la figure : None, 'category' (modèle du
+    premier argument) ou 'all' (tous les modèles).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
             try:
-                fitted_values = pd.Series(fitted).values
-            except:
-                return None
-        
-        # Générer des trimestres pour les fitted values
-        # Utiliser les trimestres du fichier Excel comme référence
-        df = load_data()
-        n_periods = len(fitted_values)
-        n_data = len(df)
-        
-        # Utiliser les trimestres existants ou générer
-        if n_periods <= n_data:
-            quarters = df['Trimestre'].iloc[:n_periods].tolist()
-        else:
-            # Générer des trimestres à partir de la dernière date du fichier Excel
-            last_quarter = df['Trimestre'].iloc[-1]
-            # Extraire l'année et le trimestre
+                key = figure_cache_key(kind, args, kwargs, model_scope)
+            except Exception:
+                return func(*args, **kwargs)
+            
+            image = figure_cache_get(key)
+            if image is None:
+                # Le rendu (et lui seul : une figure en cache reste servie) passe par le limiteur
+                with heavy_slot(), stage_timer('figure_render', args[0] if args else 'all'):
+                    image = func(*args, **kwargs)
+                if image is not None:
+                    figure_cache_put(key, image)
+            return image
+        
+        wrapper.cache_key = lambda *args, **kwargs: figure_cache_key(kind, args, kwargs, model_scope)
+        wrapper.model_scope = model_scope
+        wrapper.kind = kind
+        return wrapper
+    return decorator
+
+
+# Valeurs ajustées des modèles : une série (trimestres, valeurs, tendance) par catégorie,
+# calculée une fois par version du modèle et du classeur
+FittedSeries = namedtuple('FittedSeries', ['quarters', 'values', 'trend'])
+fitted_cache = SingleFlightCache()
+
+
+def _read_only(array):
+    """Rend un tableau NumPy non modifiable"""
+    array.flags.writeable = False
+    return array
+
+
+def _compute_fitted_series(category_name):
+    """Calcule la série des valeurs ajustées d'une catégorie (None si le modèle n'en fournit pas)"""
+    model = load_model(category_name)
+    fitted = None
+    
+    # Essayer différentes méthodes pour obtenir les fitted values
+    if hasattr(model, 'fittedvalues'):
+        fitted = model.fittedvalues
+    elif hasattr(model, 'fitted_values'):
+        fitted = model.fitted_values
+    elif hasattr(model, 'predict'):
+        try:
+            # Essayer de prédire sur les données d'entraînement
+            fitted = model.predict()
+        except:
             try:
-                year = int(last_quarter[:4])
-                quarter = int(last_quarter[-1])
+                # Essayer avec start et end
+                fitted = model.predict(start=0)
             except:
-                year = 2023
-                quarter = 4
-            
-            quarters = []
-            for i in range(n_periods):
-                q = quarter - (n_periods - i - 1)
-                y = year
-                while q <= 0:
-                    q += 4
-                    y -= 1
-                while q > 4:
-                    q -= 4
-                    y += 1
-                quarters.append(f"{y}T{q}")
-        
-        return pd.DataFrame({'Trimestre': quarters, 'Valeur': fitted_values})
+                pass
+    
+    if fitted is None:
+        return None
+    
+    # Convertir en array numpy si nécessaire
+    if hasattr(fitted, 'values'):
+        fitted_values = fitted.values
+    elif hasattr(fitted, 'iloc'):
+        fitted_values = fitted.iloc[:].values
+    elif isinstance(fitted, (list, tuple)):
+        fitted_values = pd.Series(fitted).values
+    else:
+        try:
+            fitted_values = pd.Series(fitted).values
+        except:
+            return None
+    
+    # Générer des trimestres pour les fitted values
+    # Utiliser les trimestres du fichier Excel comme référence
+    df = load_data()
+    n_periods = len(fitted_values)
+    n_data = len(df)
+    
+    # Utiliser les trimestres existants ou générer
+    if n_periods <= n_data:
+        quarters = df['Trimestre'].iloc[:n_periods].to_numpy(dtype=str)
+    else:
+        # Le modèle couvre plus de trimestres que le classeur : générer les trimestres depuis le début des données
+        first_index = quarter_index(DATA_START_YEAR, DATA_START_QUARTER)
+        quarters = np.array([format_quarter_index(k) for k in range(first_index, first_index + n_periods)])
+    
+    values = np.asarray(fitted_values, dtype=float)
+    # Tendance avec moyenne mobile centrée (fenêtre = 4 trimestres)
+    trend = pd.Series(values).rolling(window=4, center=True).mean().to_numpy()
+    return FittedSeries(_read_only(quarters), _read_only(values.copy()), _read_only(trend))
+
+
+def get_fitted_series(category_name):
+    """Série des valeurs ajustées d'une catégorie depuis le cache (tableaux en lecture seule)"""
+    version = (get_model_version(category_name), get_data_version())
+    store = get_series_store()
+    if store is not None and store.covers(category_name, *version):
+        return store.fitted_series(category_name)
+    return fitted_cache.get(category_name, version, lambda: _compute_fitted_series(category_name))
+
+
+def get_model_fitted_values(category_name, with_trend=False):
+    """Récupère les valeurs ajustées du modèle SARIMA pour une catégorie (et la tendance si demandée)"""
+    try:
+        series = get_fitted_series(category_name)
+        if series is None:
+            return None
+        
+        columns = {'Trimestre': series.quarters, 'Valeur': series.values}
+        if with_trend:
+            columns['Tendance'] = series.trend
+        return pd.DataFrame(columns)
     except Exception as e:
         print(f"Erreur pour {category_name}: {str(e)}")
         return None
 
 
-def generate_trend_plot(category_name, column_name, color):
+# Résolution des figures (points par pouce) : défaut et bornes acceptées par /api/plot (?dpi=)
+PLOT_DEFAULT_DPI = 100
+PLOT_MIN_DPI = 50
+PLOT_MAX_DPI = 300
+
+# Gabarits des figures : taille (pouces), marges fixes (fractions de la figure) et habillage des axes.
+# Les marges fixes remplacent tight_layout et bbox_inches='tight' : une seule passe de dessin par rendu.
+FIGURE_TEMPLATES = {
+    # Séries trimestrielles : libellés des trimestres verticaux sous l'axe
+    'series': {
+        'figsize': (14, 6),
+        'margins': {'left': 0.06, 'right': 0.985, 'top': 0.9, 'bottom': 0.2},
+        'xlabel': 'Trimestre', 'ylabel': 'Taux de chômage (%)', 'grid_axis': 'both',
+        'xticks': {'rotation': 90, 'labelsize': 9}
+    },
+    # Comparaison Urbain/Rural/Ensemble (grand format)
+    'comparison_line': {
+        'figsize': (16, 8),
+        'margins': {'left': 0.055, 'right': 0.985, 'top': 0.925, 'bottom': 0.16},
+        'xlabel': 'Trimestre', 'ylabel': 'Taux de chômage (%)', 'grid_axis': 'both',
+        'xticks': {'rotation': 90, 'labelsize': 9}
+    },
+    # Barres par catégorie : noms des catégories inclinés à 45°
+    'comparison_bar': {
+        'figsize': (16, 8),
+        'margins': {'left': 0.055, 'right': 0.985, 'top': 0.925, 'bottom': 0.14},
+        'xlabel': None, 'ylabel': 'Taux de chômage (%)', 'grid_axis': 'y',
+        'xticks': {'rotation': 45, 'labelsize': 10}
+    },
+    # Histogramme : axe des abscisses numérique
+    'distribution': {
+        'figsize': (14, 6),
+        'margins': {'left': 0.06, 'right': 0.985, 'top': 0.9, 'bottom': 0.11},
+        'xlabel': 'Taux de chômage (%)', 'ylabel': 'Fréquence', 'grid_axis': 'y',
+        'xticks': {}
+    }
+}
+
+# Style commun des titres et des libellés d'axes
+FIGURE_TITLE_STYLE = {'fontsize': 16, 'fontweight': 'bold', 'color': '#003366', 'pad': 20}
+FIGURE_LABEL_STYLE = {'fontsize': 12, 'fontweight': 'bold'}
+
+# Figures réutilisables par gabarit : listes de (figure, axes) libres, partagées par les threads
+# (au plus FIGURE_POOL_SIZE figures libres par gabarit)
+_figure_pool = {}
+_figure_pool_lock = threading.Lock()
+
+
+def _create_figure(template):
+    """Crée une figure habillée selon son gabarit, attachée à un canvas Agg (sans pyplot)"""
+    spec = FIGURE_TEMPLATES[template]
+    fig = Figure(figsize=spec['figsize'], facecolor='white')
+    FigureCanvasAgg(fig)
+    fig.subplots_adjust(**spec['margins'])
+    ax = fig.add_subplot()
+    if spec['xlabel']:
+        ax.set_xlabel(spec['xlabel'], **FIGURE_LABEL_STYLE)
+    ax.set_ylabel(spec['ylabel'], **FIGURE_LABEL_STYLE)
+    ax.grid(True, alpha=0.3, linestyle='--', axis=spec['grid_axis'])
+    ax.tick_params(axis='x', **spec['xticks'])
+    return fig, ax
+
+
+def _clear_axes(ax):
+    """Retire les tracés, textes, légende et titre d'un axe en conservant son habillage"""
+    for artist in [*ax.lines, *ax.collections, *ax.patches, *ax.texts]:
+        artist.remove()
+    legend = ax.get_legend()
+    if legend is not None:
+        legend.remove()
+    ax.set_title('')
+    ax.relim()
+
+
+@contextlib.contextmanager
+def figure_template(template):
+    """
+    Prête une figure vide du gabarit demandé (réservée au thread appelant) et la remet dans le pool
+    après usage : la figure, ses axes et leur habillage ne sont créés qu'une fois.
+    Une figure dont le tracé a échoué n'est pas réutilisée.
+    """
+    with _figure_pool_lock:
+        free = _figure_pool.setdefault(template, [])
+        entry = free.pop() if free else None
+    fig, ax = entry or _create_figure(template)
+    try:
+        yield fig, ax
+    except BaseException:
+        # Figure à moitié tracée : abandonnée, jamais remise dans le pool
+        raise
+    else:
+        _clear_axes(ax)
+        with _figure_pool_lock:
+            if len(free) < max(1, app.config['FIGURE_POOL_SIZE']):
+                free.append((fig, ax))
+
+
+def set_quarter_axis(ax, quarters):
+    """Place un trimestre par position sur l'axe des abscisses ; retourne les positions à tracer"""
+    # Positions numériques et libellés fixes : un axe catégoriel garderait les trimestres des rendus précédents
+    positions = np.arange(len(quarters))
+    ax.set_xticks(positions, list(quarters))
+    return positions
+
+
+def figure_to_base64(fig, fmt='png', dpi=PLOT_DEFAULT_DPI):
+    """Encode une figure (PNG, SVG, SVG compressé ou WebP) en base64, en une seule passe de dessin"""
+    img_buffer = io.BytesIO()
+    if fmt == 'webp':
+        # WebP sans perte : deux à trois fois plus léger que le PNG pour des aplats de couleur
+        fig.savefig(img_buffer, format='webp', dpi=dpi, pil_kwargs={'lossless': True})
+    else:
+        fig.savefig(img_buffer, format='svg' if fmt == 'svgz' else fmt, dpi=dpi)
+    data = img_buffer.getvalue()
+    if fmt == 'svgz':
+        data = gzip.compress(data, compresslevel=9, mtime=0)
+    with stage_timer('base64_encode'):
+        return base64.b64encode(data).decode('utf-8')
+
+
+@cached_figure('trend')
+def generate_trend_plot(category_name, column_name, color, fmt='png', dpi=PLOT_DEFAULT_DPI):
     """Génère un graphique de tendance avec moyenne mobile centrée depuis Excel"""
     try:
         df = load_data()
@@ -243,88 +1053,48 @@ def generate_trend_plot(category_name, column_name, color):
         if len(df_copy) == 0:
             return None
         
-        # Créer le graphique avec figure explicite
-        fig, ax = plt.subplots(figsize=(14, 6))
-        ax.plot(df_copy['Trimestre'], df_copy[column_name], label=category_name, color=color, linewidth=2, marker='o', markersize=3)
-        ax.plot(df_copy['Trimestre'], df_copy['Tendance'], linewidth=3, label=f'Tendance {category_name}', color='#003366', linestyle='--')
-        ax.tick_params(axis='x', rotation=90, labelsize=9)
-        ax.set_title(f"Tendance du chômage – {category_name}", fontsize=16, fontweight='bold', color='#003366', pad=20)
-        ax.set_xlabel('Trimestre', fontsize=12, fontweight='bold')
-        ax.set_ylabel('Taux de chômage (%)', fontsize=12, fontweight='bold')
-        ax.grid(True, alpha=0.3, linestyle='--')
-        ax.legend(fontsize=11, loc='best')
-        fig.tight_layout()
-        
-        # S'assurer que le canvas est initialisé
-        if fig.canvas is None:
-            from matplotlib.backends.backend_agg import FigureCanvasAgg
-            FigureCanvasAgg(fig)
-        
-        # Convertir en base64
-        img_buffer = io.BytesIO()
-        fig.savefig(img_buffer, format='png', dpi=100, bbox_inches='tight', facecolor='white')
-        img_buffer.seek(0)
-        img_base64 = base64.b64encode(img_buffer.getvalue()).decode('utf-8')
-        plt.close(fig)
-        
-        return img_base64
+        with figure_template('series') as (fig, ax):
+            x = set_quarter_axis(ax, df_copy['Trimestre'])
+            ax.plot(x, df_copy[column_name], label=category_name, color=color, linewidth=2, marker='o', markersize=3)
+            ax.plot(x, df_copy['Tendance'], linewidth=3, label=f'Tendance {category_name}', color='#003366', linestyle='--')
+            ax.set_title(f"Tendance du chômage – {category_name}", **FIGURE_TITLE_STYLE)
+            ax.legend(fontsize=11, loc='best')
+            return figure_to_base64(fig, fmt, dpi)
     except Exception as e:
         print(f"Erreur dans generate_trend_plot pour {category_name}: {str(e)}")
-        if 'fig' in locals():
-            plt.close(fig)
         return None
 
 
-def generate_trend_plot_from_model(category_name, color):
+@cached_figure('trend_model', model_scope='category')
+def generate_trend_plot_from_model(category_name, color, fmt='png', dpi=PLOT_DEFAULT_DPI):
     """Génère un graphique de tendance avec moyenne mobile centrée depuis le modèle SARIMA"""
     try:
-        df_fitted = get_model_fitted_values(category_name)
+        # Valeurs ajustées avec la tendance (moyenne mobile centrée) précalculée
+        df_fitted = get_model_fitted_values(category_name, with_trend=True)
         
         if df_fitted is None or len(df_fitted) == 0:
             return None
         
-        # Calcul de la tendance avec moyenne mobile centrée (fenêtre = 4 trimestres)
-        df_fitted['Tendance'] = df_fitted['Valeur'].rolling(window=4, center=True).mean()
-        
         # Supprimer les NaN
         df_fitted = df_fitted.dropna()
         
         if len(df_fitted) == 0:
             return None
         
-        # Créer le graphique avec figure explicite
-        fig, ax = plt.subplots(figsize=(14, 6))
-        ax.plot(df_fitted['Trimestre'], df_fitted['Valeur'], label=category_name, color=color, linewidth=2, marker='o', markersize=3)
-        ax.plot(df_fitted['Trimestre'], df_fitted['Tendance'], linewidth=3, label=f'Tendance {category_name}', color='#003366', linestyle='--')
-        ax.tick_params(axis='x', rotation=90, labelsize=9)
-        ax.set_title(f"Tendance du chômage – {category_name}", fontsize=16, fontweight='bold', color='#003366', pad=20)
-        ax.set_xlabel('Trimestre', fontsize=12, fontweight='bold')
-        ax.set_ylabel('Taux de chômage (%)', fontsize=12, fontweight='bold')
-        ax.grid(True, alpha=0.3, linestyle='--')
-        ax.legend(fontsize=11, loc='best')
-        fig.tight_layout()
-        
-        # S'assurer que le canvas est initialisé
-        if fig.canvas is None:
-            from matplotlib.backends.backend_agg import FigureCanvasAgg
-            FigureCanvasAgg(fig)
-        
-        # Convertir en base64
-        img_buffer = io.BytesIO()
-        fig.savefig(img_buffer, format='png', dpi=100, bbox_inches='tight', facecolor='white')
-        img_buffer.seek(0)
-        img_base64 = base64.b64encode(img_buffer.getvalue()).decode('utf-8')
-        plt.close(fig)
-        
-        return img_base64
+        with figure_template('series') as (fig, ax):
+            x = set_quarter_axis(ax, df_fitted['Trimestre'])
+            ax.plot(x, df_fitted['Valeur'], label=category_name, color=color, linewidth=2, marker='o', markersize=3)
+            ax.plot(x, df_fitted['Tendance'], linewidth=3, label=f'Tendance {category_name}', color='#003366', linestyle='--')
+            ax.set_title(f"Tendance du chômage – {category_name}", **FIGURE_TITLE_STYLE)
+            ax.legend(fontsize=11, loc='best')
+            return figure_to_base64(fig, fmt, dpi)
     except Exception as e:
         print(f"Erreur dans generate_trend_plot_from_model pour {category_name}: {str(e)}")
-        if 'fig' in locals():
-            plt.close(fig)
         return None
 
 
-def generate_simple_plot(category_name, column_name, color):
+@cached_figure('simple')
+def generate_simple_plot(category_name, column_name, color, fmt='png', dpi=PLOT_DEFAULT_DPI):
     """Génère un graphique simple du taux de chômage"""
     try:
         df = load_data()
@@ -338,37 +1108,19 @@ def generate_simple_plot(category_name, column_name, color):
         if len(df_clean) == 0:
             return None
         
-        # Créer le graphique avec figure explicite
-        fig, ax = plt.subplots(figsize=(14, 6))
-        ax.plot(df_clean['Trimestre'], df_clean[column_name], label=category_name, color=color, linewidth=2, marker='o', markersize=4)
-        ax.tick_params(axis='x', rotation=90, labelsize=9)
-        ax.set_title(f"Taux de chômage – {category_name}", fontsize=16, fontweight='bold', color='#003366', pad=20)
-        ax.set_xlabel('Trimestre', fontsize=12, fontweight='bold')
-        ax.set_ylabel('Taux de chômage (%)', fontsize=12, fontweight='bold')
-        ax.grid(True, alpha=0.3, linestyle='--')
-        ax.legend(fontsize=11, loc='best')
-        fig.tight_layout()
-        
-        # S'assurer que le canvas est initialisé
-        if fig.canvas is None:
-            from matplotlib.backends.backend_agg import FigureCanvasAgg
-            FigureCanvasAgg(fig)
-        
-        img_buffer = io.BytesIO()
-        fig.savefig(img_buffer, format='png', dpi=100, bbox_inches='tight', facecolor='white')
-        img_buffer.seek(0)
-        img_base64 = base64.b64encode(img_buffer.getvalue()).decode('utf-8')
-        plt.close(fig)
-        
-        return img_base64
+        with figure_template('series') as (fig, ax):
+            x = set_quarter_axis(ax, df_clean['Trimestre'])
+            ax.plot(x, df_clean[column_name], label=category_name, color=color, linewidth=2, marker='o', markersize=4)
+            ax.set_title(f"Taux de chômage – {category_name}", **FIGURE_TITLE_STYLE)
+            ax.legend(fontsize=11, loc='best')
+            return figure_to_base64(fig, fmt, dpi)
     except Exception as e:
         print(f"Erreur dans generate_simple_plot pour {category_name}: {str(e)}")
-        if 'fig' in locals():
-            plt.close(fig)
         return None
 
 
-def generate_simple_plot_from_model(category_name, color):
+@cached_figure('simple_model', model_scope='category')
+def generate_simple_plot_from_model(category_name, color, fmt='png', dpi=PLOT_DEFAULT_DPI):
     """Génère un graphique simple depuis le modèle SARIMA"""
     try:
         df_fitted = get_model_fitted_values(category_name)
@@ -382,37 +1134,19 @@ def generate_simple_plot_from_model(category_name, color):
         if len(df_clean) == 0:
             return None
         
-        # Créer le graphique avec figure explicite
-        fig, ax = plt.subplots(figsize=(14, 6))
-        ax.plot(df_clean['Trimestre'], df_clean['Valeur'], label=category_name, color=color, linewidth=2, marker='o', markersize=4)
-        ax.tick_params(axis='x', rotation=90, labelsize=9)
-        ax.set_title(f"Taux de chômage – {category_name}", fontsize=16, fontweight='bold', color='#003366', pad=20)
-        ax.set_xlabel('Trimestre', fontsize=12, fontweight='bold')
-        ax.set_ylabel('Taux de chômage (%)', fontsize=12, fontweight='bold')
-        ax.grid(True, alpha=0.3, linestyle='--')
-        ax.legend(fontsize=11, loc='best')
-        fig.tight_layout()
-        
-        # S'assurer que le canvas est initialisé
-        if fig.canvas is None:
-            from matplotlib.backends.backend_agg import FigureCanvasAgg
-            FigureCanvasAgg(fig)
-        
-        img_buffer = io.BytesIO()
-        fig.savefig(img_buffer, format='png', dpi=100, bbox_inches='tight', facecolor='white')
-        img_buffer.seek(0)
-        img_base64 = base64.b64encode(img_buffer.getvalue()).decode('utf-8')
-        plt.close(fig)
-        
-        return img_base64
+        with figure_template('series') as (fig, ax):
+            x = set_quarter_axis(ax, df_clean['Trimestre'])
+            ax.plot(x, df_clean['Valeur'], label=category_name, color=color, linewidth=2, marker='o', markersize=4)
+            ax.set_title(f"Taux de chômage – {category_name}", **FIGURE_TITLE_STYLE)
+            ax.legend(fontsize=11, loc='best')
+            return figure_to_base64(fig, fmt, dpi)
     except Exception as e:
         print(f"Erreur dans generate_simple_plot_from_model pour {category_name}: {str(e)}")
-        if 'fig' in locals():
-            plt.close(fig)
         return None
 
 
-def generate_comparison_bar_chart():
+@cached_figure('comparison_bar', model_scope='all')
+def generate_comparison_bar_chart(fmt='png', dpi=PLOT_DEFAULT_DPI):
     """Génère un graphique en barres comparant toutes les catégories"""
     categories_data = {}
     df = load_data()
@@ -456,37 +1190,22 @@ def generate_comparison_bar_chart():
     values = [item[1]['value'] for item in sorted_data]
     colors = [item[1]['color'] for item in sorted_data]
     
-    # Créer le graphique avec figure explicite
-    fig, ax = plt.subplots(figsize=(16, 8))
-    bars = ax.bar(range(len(categories)), values, color=colors, alpha=0.8, edgecolor='#003366', linewidth=1.5)
-    ax.set_xticks(range(len(categories)))
-    ax.set_xticklabels(categories, rotation=45, ha='right', fontsize=10)
-    ax.set_ylabel('Taux de chômage (%)', fontsize=12, fontweight='bold')
-    ax.set_title('Comparaison du taux de chômage par catégorie', fontsize=16, fontweight='bold', color='#003366', pad=20)
-    ax.grid(True, alpha=0.3, axis='y', linestyle='--')
-    
-    # Ajouter les valeurs sur les barres
-    for i, (bar, val) in enumerate(zip(bars, values)):
-        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5, 
-                f'{val:.1f}%', ha='center', va='bottom', fontsize=9, fontweight='bold')
-    
-    fig.tight_layout()
-    
-    # S'assurer que le canvas est initialisé
-    if fig.canvas is None:
-        from matplotlib.backends.backend_agg import FigureCanvasAgg
-        FigureCanvasAgg(fig)
-    
-    img_buffer = io.BytesIO()
-    fig.savefig(img_buffer, format='png', dpi=100, bbox_inches='tight', facecolor='white')
-    img_buffer.seek(0)
-    img_base64 = base64.b64encode(img_buffer.getvalue()).decode('utf-8')
-    plt.close(fig)
-    
-    return img_base64
+    with figure_template('comparison_bar') as (fig, ax):
+        positions = np.arange(len(categories))
+        ax.set_xticks(positions, categories, ha='right')
+        bars = ax.bar(positions, values, color=colors, alpha=0.8, edgecolor='#003366', linewidth=1.5)
+        ax.set_title('Comparaison du taux de chômage par catégorie', **FIGURE_TITLE_STYLE)
+        
+        # Ajouter les valeurs sur les barres
+        for bar, val in zip(bars, values):
+            ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5, 
+                    f'{val:.1f}%', ha='center', va='bottom', fontsize=9, fontweight='bold')
+        
+        return figure_to_base64(fig, fmt, dpi)
 
 
-def generate_area_plot(category_name, column_name, color):
+@cached_figure('area')
+def generate_area_plot(category_name, column_name, color, fmt='png', dpi=PLOT_DEFAULT_DPI):
     """Génère un graphique en aires pour une catégorie"""
     try:
         df = load_data()
@@ -499,36 +1218,20 @@ def generate_area_plot(category_name, column_name, color):
         if len(df_clean) == 0:
             return None
         
-        fig, ax = plt.subplots(figsize=(14, 6))
-        ax.fill_between(df_clean['Trimestre'], df_clean[column_name], alpha=0.4, color=color, label=category_name)
-        ax.plot(df_clean['Trimestre'], df_clean[column_name], color=color, linewidth=2, marker='o', markersize=3)
-        ax.tick_params(axis='x', rotation=90, labelsize=9)
-        ax.set_title(f"Évolution du chômage – {category_name}", fontsize=16, fontweight='bold', color='#003366', pad=20)
-        ax.set_xlabel('Trimestre', fontsize=12, fontweight='bold')
-        ax.set_ylabel('Taux de chômage (%)', fontsize=12, fontweight='bold')
-        ax.grid(True, alpha=0.3, linestyle='--')
-        ax.legend(fontsize=11, loc='best')
-        fig.tight_layout()
-        
-        if fig.canvas is None:
-            from matplotlib.backends.backend_agg import FigureCanvasAgg
-            FigureCanvasAgg(fig)
-        
-        img_buffer = io.BytesIO()
-        fig.savefig(img_buffer, format='png', dpi=100, bbox_inches='tight', facecolor='white')
-        img_buffer.seek(0)
-        img_base64 = base64.b64encode(img_buffer.getvalue()).decode('utf-8')
-        plt.close(fig)
-        
-        return img_base64
+        with figure_template('series') as (fig, ax):
+            x = set_quarter_axis(ax, df_clean['Trimestre'])
+            ax.fill_between(x, df_clean[column_name], alpha=0.4, color=color, label=category_name)
+            ax.plot(x, df_clean[column_name], color=color, linewidth=2, marker='o', markersize=3)
+            ax.set_title(f"Évolution du chômage – {category_name}", **FIGURE_TITLE_STYLE)
+            ax.legend(fontsize=11, loc='best')
+            return figure_to_base64(fig, fmt, dpi)
     except Exception as e:
         print(f"Erreur dans generate_area_plot pour {category_name}: {str(e)}")
-        if 'fig' in locals():
-            plt.close(fig)
         return None
 
 
-def generate_histogram_plot():
+@cached_figure('histogram')
+def generate_histogram_plot(fmt='png', dpi=PLOT_DEFAULT_DPI):
     """Génère un histogramme de la distribution des taux de chômage"""
     try:
         df = load_data()
@@ -542,33 +1245,17 @@ def generate_histogram_plot():
         if len(all_values) == 0:
             return None
         
-        fig, ax = plt.subplots(figsize=(14, 6))
-        ax.hist(all_values, bins=20, color='#003366', alpha=0.7, edgecolor='#002244', linewidth=1.5)
-        ax.set_xlabel('Taux de chômage (%)', fontsize=12, fontweight='bold')
-        ax.set_ylabel('Fréquence', fontsize=12, fontweight='bold')
-        ax.set_title('Distribution des taux de chômage', fontsize=16, fontweight='bold', color='#003366', pad=20)
-        ax.grid(True, alpha=0.3, axis='y', linestyle='--')
-        fig.tight_layout()
-        
-        if fig.canvas is None:
-            from matplotlib.backends.backend_agg import FigureCanvasAgg
-            FigureCanvasAgg(fig)
-        
-        img_buffer = io.BytesIO()
-        fig.savefig(img_buffer, format='png', dpi=100, bbox_inches='tight', facecolor='white')
-        img_buffer.seek(0)
-        img_base64 = base64.b64encode(img_buffer.getvalue()).decode('utf-8')
-        plt.close(fig)
-        
-        return img_base64
+        with figure_template('distribution') as (fig, ax):
+            ax.hist(all_values, bins=20, color='#003366', alpha=0.7, edgecolor='#002244', linewidth=1.5)
+            ax.set_title('Distribution des taux de chômage', **FIGURE_TITLE_STYLE)
+            return figure_to_base64(fig, fmt, dpi)
     except Exception as e:
         print(f"Erreur dans generate_histogram_plot: {str(e)}")
-        if 'fig' in locals():
-            plt.close(fig)
         return None
 
 
-def generate_comparison_line_plot():
+@cached_figure('comparison_line')
+def generate_comparison_line_plot(fmt='png', dpi=PLOT_DEFAULT_DPI):
     """Génère un graphique comparatif en lignes pour Urbain, Rural et Ensemble"""
     try:
         df = load_data()
@@ -581,192 +1268,1469 @@ def generate_comparison_line_plot():
         if len(df_clean) == 0:
             return None
         
-        fig, ax = plt.subplots(figsize=(16, 8))
-        ax.plot(df_clean['Trimestre'], df_clean['Urbain'], label='Urbain', color='#0066CC', linewidth=2.5, marker='o', markersize=4)
-        ax.plot(df_clean['Trimestre'], df_clean['Rural'], label='Rural', color='#FF6600', linewidth=2.5, marker='s', markersize=4)
-        ax.plot(df_clean['Trimestre'], df_clean['Ensemble'], label='Ensemble', color='#006233', linewidth=2.5, marker='^', markersize=4)
-        ax.tick_params(axis='x', rotation=90, labelsize=9)
-        ax.set_title('Comparaison Urbain, Rural et Ensemble', fontsize=16, fontweight='bold', color='#003366', pad=20)
-        ax.set_xlabel('Trimestre', fontsize=12, fontweight='bold')
-        ax.set_ylabel('Taux de chômage (%)', fontsize=12, fontweight='bold')
-        ax.grid(True, alpha=0.3, linestyle='--')
-        ax.legend(fontsize=12, loc='best', framealpha=0.9)
-        fig.tight_layout()
-        
-        if fig.canvas is None:
-            from matplotlib.backends.backend_agg import FigureCanvasAgg
-            FigureCanvasAgg(fig)
-        
-        img_buffer = io.BytesIO()
-        fig.savefig(img_buffer, format='png', dpi=100, bbox_inches='tight', facecolor='white')
-        img_buffer.seek(0)
-        img_base64 = base64.b64encode(img_buffer.getvalue()).decode('utf-8')
-        plt.close(fig)
-        
-        return img_base64
+        with figure_template('comparison_line') as (fig, ax):
+            x = set_quarter_axis(ax, df_clean['Trimestre'])
+            ax.plot(x, df_clean['Urbain'], label='Urbain', color='#0066CC', linewidth=2.5, marker='o', markersize=4)
+            ax.plot(x, df_clean['Rural'], label='Rural', color='#FF6600', linewidth=2.5, marker='s', markersize=4)
+            ax.plot(x, df_clean['Ensemble'], label='Ensemble', color='#006233', linewidth=2.5, marker='^', markersize=4)
+            ax.set_title('Comparaison Urbain, Rural et Ensemble', **FIGURE_TITLE_STYLE)
+            ax.legend(fontsize=12, loc='best', framealpha=0.9)
+            return figure_to_base64(fig, fmt, dpi)
     except Exception as e:
         print(f"Erreur dans generate_comparison_line_plot: {str(e)}")
-        if 'fig' in locals():
-            plt.close(fig)
         return None
 
 
-def get_forecast_period(year, quarter):
+
+# Premier trimestre des séries d'entraînement des modèles (début du classeur HCP)
+DATA_START_YEAR = 2006
+DATA_START_QUARTER = 1
+
+
+def quarter_index(year, quarter):
+    """Indice absolu d'un trimestre (année * 4 + trimestre - 1)"""
+    return year * 4 + quarter - 1
+
+
+def quarter_from_index(index):
+    """Retourne (année, trimestre) d'un indice absolu de trimestre"""
+    return index // 4, index % 4 + 1
+
+
+def format_quarter_index(index):
+    """Libellé 'AAAATq' d'un indice absolu de trimestre"""
+    year, quarter = quarter_from_index(index)
+    return f'{year}{quarter_names[quarter]}'
+
+
+def get_model_origin(model):
+    """Indice du dernier trimestre observé par un modèle : début des données + nombre d'observations - 1"""
+    return quarter_index(DATA_START_YEAR, DATA_START_QUARTER) + int(model.nobs) - 1
+
+
+def get_forecast_period(year, quarter, origin):
     """
-    Calcule le nombre de périodes (trimestres) à prédire.
-    On suppose que les données d'entraînement vont jusqu'à T4 2023.
+    Calcule le nombre de périodes (trimestres) à prédire après `origin`,
+    indice du dernier trimestre observé par le modèle.
     """
-    REFERENCE_YEAR = 2023
-    REFERENCE_QUARTER = 4
-    
-    quarters_ahead = (year - REFERENCE_YEAR) * 4 + (quarter - REFERENCE_QUARTER)
+    quarters_ahead = quarter_index(year, quarter) - origin
     
     if quarters_ahead <= 0:
-        raise ValueError(f"La date demandée ({quarter_names.get(quarter, quarter)} {year}) doit être après {quarter_names[REFERENCE_QUARTER]} {REFERENCE_YEAR}")
+        origin_year, origin_quarter = quarter_from_index(origin)
+        raise ValueError(f"La date demandée ({quarter_names.get(quarter, quarter)} {year}) doit être après {quarter_names[origin_quarter]} {origin_year}")
     
     return quarters_ahead
 
 
-@app.route('/')
-def home():
-    """Page d'accueil principale"""
-    return render_template('home.html', category_hierarchy=CATEGORY_HIERARCHY)
+def compute_forecast_path(model, steps):
+    """Calcule la trajectoire complète des prévisions sur `steps` trimestres selon le type de modèle"""
+    # Méthode 1: get_forecast() pour statsmodels SARIMAX (recommandé)
+    if hasattr(model, 'get_forecast'):
+        result = model.get_forecast(steps=steps).predicted_mean
+    # Méthode 2: forecast() pour statsmodels SARIMAX
+    elif hasattr(model, 'forecast'):
+        result = model.forecast(steps=steps)
+    # Méthode 3: predict() générique
+    elif hasattr(model, 'predict'):
+        result = model.predict(steps=steps)
+    else:
+        raise AttributeError("Le modèle ne possède aucune méthode de prédiction connue")
+    
+    return np.asarray(result, dtype=float).ravel()
 
 
-@app.route('/prediction')
-def index():
-    """Page de prédiction avec le formulaire"""
-    return render_template('index.html', category_hierarchy=CATEGORY_HIERARCHY)
+def parse_quarter_label(label):
+    """Analyse un trimestre au format 'AAAATq' (ex. '2030T2') et retourne (année, trimestre)"""
+    match = re.fullmatch(r'\s*(\d{4})\s*[Tt]([1-4])\s*', label or '')
+    if match is None:
+        raise ValueError(f"Trimestre '{label}' non valide (format attendu : AAAATq, ex. 2030T2)")
+    return int(match.group(1)), int(match.group(2))
 
 
-@app.route('/about')
-def about():
-    """Page À propos"""
-    return render_template('about.html')
+# Horizon maximal (trimestres après la fin des données du modèle) accepté par /predict, /predict/batch,
+# /api/forecast et /api/export
+FORECAST_API_MAX_STEPS = 400
 
 
-@app.route('/dashboard')
-def dashboard():
-    """Tableau de bord avec visualisations"""
-    visualizations = []
-    df = load_data()
-    
-    # Section 1: Graphiques de tendance avec moyenne mobile
-    trend_visualizations = []
-    
-    # Parcourir toutes les catégories et sous-catégories
-    for main_cat, info in CATEGORY_HIERARCHY.items():
-        # Catégorie principale avec données Excel
-        if info.get('excel_column') and info['excel_column'] in df.columns:
-            plot = generate_trend_plot(main_cat, info['excel_column'], info.get('color', '#003366'))
-            if plot:
-                trend_visualizations.append({
-                    'name': f'Tendance - {main_cat}',
-                    'image': plot,
-                    'type': 'tendance'
-                })
-        
-        # Sous-catégories
-        if info.get('subcategories'):
-            for sub_cat, sub_info in info['subcategories'].items():
-                # Si données Excel disponibles
-                if sub_info.get('excel_column') and sub_info['excel_column'] in df.columns:
-                    plot = generate_trend_plot(sub_cat, sub_info['excel_column'], sub_info.get('color', '#003366'))
-                    if plot:
-                        trend_visualizations.append({
-                            'name': f'Tendance - {sub_cat}',
-                            'image': plot,
-                            'type': 'tendance'
-                        })
-                # Sinon, utiliser le modèle SARIMA
-                elif sub_info.get('model'):
-                    plot = generate_trend_plot_from_model(sub_cat, sub_info.get('color', '#003366'))
-                    if plot:
-                        trend_visualizations.append({
-                            'name': f'Tendance - {sub_cat}',
-                            'image': plot,
-                            'type': 'tendance'
-                        })
+def check_forecast_horizon(steps):
+    """Refuse (ValueError) un horizon au-delà de FORECAST_API_MAX_STEPS trimestres"""
+    if steps > FORECAST_API_MAX_STEPS:
+        raise ValueError(f'Horizon trop lointain ({steps} trimestres), maximum {FORECAST_API_MAX_STEPS}')
+
+
+def parse_forecast_range(start_label=None, end_label=None, alpha=None):
+    """
+    Valide une plage de prévision ('AAAATq' ; début par défaut : premier trimestre prévu par chaque modèle,
+    fin par défaut : T4 FORECAST_TABLE_LAST_YEAR) et un niveau alpha.
+    Retourne (indice du premier trimestre ou None, indice du dernier trimestre, alpha).
+    """
+    start = quarter_index(*parse_quarter_label(start_label)) if start_label else None
+    end = quarter_index(*parse_quarter_label(end_label or f'{FORECAST_TABLE_LAST_YEAR}T4'))
+    if start is not None and end < start:
+        raise ValueError('Le trimestre de fin doit être après le trimestre de début')
     
-    # Section 2: Graphiques simples du taux de chômage
-    simple_visualizations = []
+    try:
+        alpha = 0.05 if alpha is None else float(alpha)
+    except ValueError:
+        raise ValueError('alpha doit être un nombre')
+    if not 0 < alpha < 1:
+        raise ValueError('alpha doit être strictement entre 0 et 1')
+    return start, end, alpha
+
+
+def get_forecast_steps(category, start, end):
+    """
+    Convertit une plage de trimestres absolus (voir parse_forecast_range) en pas de prévision du modèle
+    d'une catégorie. Retourne (origine, premier pas, dernier pas).
+    """
+    origin = get_forecast_origin(category)
+    first = 1 if start is None else get_forecast_period(*quarter_from_index(start), origin)
+    last = get_forecast_period(*quarter_from_index(end), origin)
+    check_forecast_horizon(last)
+    return origin, first, last
+
+
+def compute_forecast_interval(model, steps, alpha=0.05):
+    """
+    Calcule en un seul appel à get_forecast la trajectoire des prévisions sur `steps` trimestres
+    et ses intervalles de confiance au niveau 1 - alpha. Retourne (moyenne, borne basse, borne haute).
+    """
+    if not hasattr(model, 'get_forecast'):
+        raise AttributeError("Le modèle ne fournit pas d'intervalles de confiance (get_forecast)")
     
-    for main_cat, info in CATEGORY_HIERARCHY.items():
-        if info.get('excel_column') and info['excel_column'] in df.columns:
-            plot = generate_simple_plot(main_cat, info['excel_column'], info.get('color', '#003366'))
-            if plot:
-                simple_visualizations.append({
-                    'name': f'Taux de chômage - {main_cat}',
-                    'image': plot,
-                    'type': 'simple'
-                })
-        
-        if info.get('subcategories'):
-            for sub_cat, sub_info in info['subcategories'].items():
-                if sub_info.get('excel_column') and sub_info['excel_column'] in df.columns:
-                    plot = generate_simple_plot(sub_cat, sub_info['excel_column'], sub_info.get('color', '#003366'))
-                    if plot:
-                        simple_visualizations.append({
-                            'name': f'Taux de chômage - {sub_cat}',
-                            'image': plot,
-                            'type': 'simple'
-                        })
-                elif sub_info.get('model'):
-                    plot = generate_simple_plot_from_model(sub_cat, sub_info.get('color', '#003366'))
-                    if plot:
-                        simple_visualizations.append({
-                            'name': f'Taux de chômage - {sub_cat}',
-                            'image': plot,
-                            'type': 'simple'
-                        })
+    forecast = model.get_forecast(steps=steps)
+    mean = np.asarray(forecast.predicted_mean, dtype=float).ravel()
+    bounds = np.asarray(forecast.conf_int(alpha=alpha), dtype=float)
+    return mean, bounds[:, 0], bounds[:, 1]
+
+
+# Moteurs de prévision disponibles pour /predict ('table' : table précalculée)
+FORECAST_ENGINES = ('table', 'statsmodels', 'numpy')
+
+# États extraits pour le moteur NumPy : catégorie -> (version du modèle, état)
+engine_states = SingleFlightCache()
+
+
+def extract_engine_state(model):
+    """
+    Extrait d'un modèle SARIMA les matrices (constantes) de l'espace d'états et l'état
+    prédit après la dernière observation, utilisés par le moteur de prévision NumPy.
+    """
+    if isinstance(model, CompactSarimaResults):
+        return {
+            'transition': model.transition,
+            'design': model.design[0],
+            'obs_intercept': float(model.obs_intercept[0]),
+            'state_intercept': model.state_intercept,
+            'state': np.asarray(model.state, dtype=float)
+        }
     
-    # Section 3: Graphique comparatif en barres
-    comparison_plot = generate_comparison_bar_chart()
+    ssm = model.model.ssm
+    matrices = {name: np.asarray(ssm[name]) for name in ('transition', 'design', 'obs_intercept', 'state_intercept')}
+    if matrices['transition'].ndim != 2 or matrices['design'].ndim != 2:
+        raise ValueError("Le moteur NumPy ne supporte que les modèles à matrices constantes")
+    return {
+        'transition': matrices['transition'],
+        'design': matrices['design'][0],
+        'obs_intercept': float(matrices['obs_intercept'].ravel()[0]),
+        'state_intercept': matrices['state_intercept'].ravel(),
+        'state': np.asarray(model.predicted_state[:, -1], dtype=float)
+    }
+
+
+def get_engine_state(category, version=None):
+    """État du moteur NumPy d'une catégorie, extrait une fois par version du modèle (du modèle de cette version)"""
+    if version is None:
+        version = get_model_version(category)
+    return engine_states.get(category, version, lambda: extract_engine_state(load_model(category, version)))
+
+
+def numpy_forecast_paths(states, steps):
+    """
+    Prévisions ponctuelles de plusieurs modèles en une seule opération empilée :
+    y(h) = Z a(h) + d, a(h+1) = T a(h) + c. Retourne un tableau (modèles, steps).
+    Les états de dimensions différentes sont complétés par des zéros.
+    """
+    n_models = len(states)
+    n_states = max(state['state'].shape[0] for state in states)
+    transition = np.zeros((n_models, n_states, n_states))
+    design = np.zeros((n_models, n_states))
+    state_intercept = np.zeros((n_models, n_states))
+    current = np.zeros((n_models, n_states))
+    obs_intercept = np.array([state['obs_intercept'] for state in states])
+    for i, state in enumerate(states):
+        m = state['state'].shape[0]
+        transition[i, :m, :m] = state['transition']
+        design[i, :m] = state['design']
+        state_intercept[i, :m] = state['state_intercept']
+        current[i, :m] = state['state']
+    
+    paths = np.empty((n_models, steps))
+    for h in range(steps):
+        paths[:, h] = np.einsum('ij,ij->i', design, current) + obs_intercept
+        current = np.einsum('ijk,ik->ij', transition, current) + state_intercept
+    return paths
+
+
+def compute_category_forecast_path(category, steps, engine='statsmodels'):
+    """Trajectoire des prévisions d'une catégorie calculée avec le moteur demandé"""
+    if engine == 'numpy':
+        state = get_engine_state(category)
+        with stage_timer('forecast', category):
+            return numpy_forecast_paths([state], steps)[0]
+    model = load_model(category)
+    with stage_timer('forecast', category):
+        return compute_forecast_path(model, steps)
+
+
+# Table de prévisions précalculées : une ligne par catégorie, une colonne par pas de prévision
+# (colonne 0 = premier trimestre après le dernier trimestre observé par le modèle de la catégorie).
+# La largeur couvre T4 FORECAST_TABLE_LAST_YEAR quelle que soit la fin des données du modèle.
+FORECAST_TABLE_LAST_YEAR = 2050
+FORECAST_TABLE_STEPS = get_forecast_period(FORECAST_TABLE_LAST_YEAR, 4,
+                                           quarter_index(DATA_START_YEAR, DATA_START_QUARTER))
+FORECAST_TABLE_INDEX = {category: i for i, category in enumerate(CATEGORY_MODELS)}
+forecast_table = np.full((len(FORECAST_TABLE_INDEX), FORECAST_TABLE_STEPS), np.nan)
+# Version du modèle ayant servi à calculer chaque ligne
+forecast_table_versions = {}
+_forecast_table_lock = threading.Lock()
+
+
+def fill_forecast_row(category, model, version):
+    """Calcule la ligne de la table de prévisions d'une catégorie à partir de son modèle ; retourne la ligne"""
+    with stage_timer('forecast', category):
+        if app.config['FORECAST_ENGINE'] == 'numpy':
+            path = numpy_forecast_paths([extract_engine_state(model)], FORECAST_TABLE_STEPS)[0]
+        else:
+            path = compute_forecast_path(model, FORECAST_TABLE_STEPS)
+    with _forecast_table_lock:
+        forecast_table[FORECAST_TABLE_INDEX[category]] = path
+        forecast_table_versions[category] = version
+    return path
+
+
+def _current_forecast_row(category, version):
+    """Copie de la ligne de la table si elle a été calculée avec le modèle `version` (None sinon)"""
+    # Lue sous le verrou : la ligne est réécrite sur place quand le modèle change
+    with _forecast_table_lock:
+        if forecast_table_versions.get(category) == version:
+            return forecast_table[FORECAST_TABLE_INDEX[category]].copy()
+    return None
+
+
+# Dernier trimestre observé par le modèle de chaque catégorie : catégorie -> (version du modèle, indice)
+forecast_origins = SingleFlightCache()
+
+
+def get_forecast_origin(category):
+    """Indice du dernier trimestre observé par le modèle d'une catégorie, lu une fois par version du modèle"""
+    version = get_model_version(category)
+    store = get_series_store()
+    if store is not None and store.covers(category, version):
+        return store.categories[category]['origin']
+    return forecast_origins.get(category, version, lambda: get_model_origin(load_model(category, version)))
+
+
+def get_forecast_row(category):
+    """Retourne la ligne de la table de prévisions d'une catégorie, recalculée si le modèle a changé"""
+    version = get_model_version(category)
+    store = get_series_store()
+    if store is not None and store.covers(category, version, engine=app.config['FORECAST_ENGINE']):
+        return store.array(category, 'forecast')
+    row = _current_forecast_row(category, version)
+    if row is None:
+        # Remplissage de la ligne (désérialisation du modèle et prévision) : borné par le limiteur
+        with heavy_slot():
+            # Le chargement du modèle remplit la ligne ; la recalculer si ce précalcul a échoué
+            model = load_model(category, version)
+            row = _current_forecast_row(category, version)
+            if row is None:
+                row = fill_forecast_row(category, model, version)
+    return row
+
+
+def build_forecast_table():
+    """Charge tous les modèles et calcule (ou met à jour) la table de prévisions, au démarrage"""
+    for category in CATEGORY_MODELS:
+        try:
+            get_forecast_row(category)
+        except Exception as e:
+            print(f"Erreur dans build_forecast_table pour {category}: {str(e)}")
+    
+    # Moteur NumPy : recalculer toutes les lignes en une seule opération empilée
+    if app.config['FORECAST_ENGINE'] == 'numpy':
+        with _forecast_table_lock:
+            versions = dict(forecast_table_versions)
+        if versions:
+            states = [get_engine_state(category, version) for category, version in versions.items()]
+            with stage_timer('forecast', 'all'):
+                paths = numpy_forecast_paths(states, FORECAST_TABLE_STEPS)
+            with _forecast_table_lock:
+                for (category, version), path in zip(versions.items(), paths):
+                    # Ligne non remplacée entre-temps par un modèle plus récent
+                    if forecast_table_versions.get(category) == version:
+                        forecast_table[FORECAST_TABLE_INDEX[category]] = path
+    return forecast_table
+
+
+# Magasin des séries : fichier en lecture seule mappé en mémoire, partagé sans copie par tous les processus.
+# Disposition : SERIES_STORE_MAGIC, longueur de l'en-tête (uint64 petit-boutiste), en-tête JSON (index des
+# tableaux et versions des sources), puis les tableaux float64 à partir d'un décalage aligné sur 64 octets.
+SERIES_STORE_MAGIC = b'SERSTOR1'
+SERIES_STORE_FORMAT_VERSION = 1
+SERIES_STORE_ARRAYS = ('history', 'fitted', 'trend', 'forecast')
+series_store_cache = SingleFlightCache()
+
+
+class SeriesStore:
+    """Lecteur du magasin des séries : les tableaux sont des vues en lecture seule sur le fichier mappé"""
+    
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(SERIES_STORE_MAGIC)] != SERIES_STORE_MAGIC:
+            raise ValueError(f"'{path}' n'est pas un magasin des séries")
+        
+        header_start = len(SERIES_STORE_MAGIC) + 8
+        (header_length,) = struct.unpack('<Q', self._map[len(SERIES_STORE_MAGIC):header_start])
+        header = json.loads(self._map[header_start:header_start + header_length].decode('utf-8'))
+        if header['format_version'] != SERIES_STORE_FORMAT_VERSION:
+            raise ValueError(f"Version de magasin des séries non supportée ({header['format_version']}) pour '{path}'")
+        
+        self.path = path
+        self.header = header
+        self.categories = header['categories']
+        self.quarters = _read_only(np.array(header['quarters']))
+        self._data_offset = header['data_offset']
+    
+    def covers(self, category, model_version, data_version=None, engine=None):
+        """Le magasin contient-il la catégorie pour ces versions du modèle (et du classeur, et ce moteur) ?"""
+        entry = self.categories.get(category)
+        if entry is None or entry['model_version'] != model_version:
+            return False
+        if data_version is not None and self.header['data_version'] != data_version:
+            return False
+        return engine is None or self.header['engine'] == engine
+    
+    def array(self, category, name):
+        """Vue float64 en lecture seule d'un tableau d'une catégorie (aucune copie)"""
+        offset, length = self.categories[category]['arrays'][name]
+        return np.frombuffer(self._map, dtype='<f8', count=length, offset=self._data_offset + offset * 8)
+    
+    def fitted_series(self, category):
+        """Valeurs ajustées et tendance d'une catégorie (None si le modèle n'en fournit pas)"""
+        values = self.array(category, 'fitted')
+        if not len(values):
+            return None
+        return FittedSeries(self.quarters[:len(values)], values, self.array(category, 'trend'))
+
+
+def write_series_store(path):
+    """
+    Construit le magasin des séries depuis load_data() et les modèles de CATEGORY_MODELS, puis le publie
+    par renommage atomique : les processus qui l'ont déjà mappé gardent l'ancienne version.
+    Retourne le nombre de catégories écrites.
+    """
+    df = load_data()
+    quarters = [str(label) for label in df['Trimestre']]
+    arrays = []
+    offset = 0
+    categories = {}
+    for category in CATEGORY_MODELS:
+        try:
+            model_version = get_model_version(category)
+            fitted = _compute_fitted_series(category)
+            forecast = get_forecast_row(category)
+            origin = get_forecast_origin(category)
+        except Exception as e:
+            print(f"Erreur dans write_series_store pour {category}: {str(e)}")
+            continue
+        
+        column = CATEGORY_EXCEL_COLUMNS.get(category)
+        entry = {
+            'history': df[column].to_numpy(dtype=float) if column in df.columns else np.empty(0),
+            'fitted': fitted.values if fitted is not None else np.empty(0),
+            'trend': fitted.trend if fitted is not None else np.empty(0),
+            'forecast': np.asarray(forecast, dtype=float)
+        }
+        if fitted is not None and len(fitted.quarters) > len(quarters):
+            quarters = [str(label) for label in fitted.quarters]
+        
+        categories[category] = {'model_version': model_version, 'origin': origin, 'arrays': {}}
+        for name in SERIES_STORE_ARRAYS:
+            categories[category]['arrays'][name] = [offset, len(entry[name])]
+            arrays.append(entry[name])
+            offset += len(entry[name])
+    
+    header = {
+        'format_version': SERIES_STORE_FORMAT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'data_version': get_data_version(),
+        'engine': app.config['FORECAST_ENGINE'],
+        'quarters': quarters,
+        'categories': categories
+    }
+    # Décalage des tableaux : après l'en-tête, aligné sur 64 octets (l'en-tête contient ce décalage)
+    prefix = len(SERIES_STORE_MAGIC) + 8
+    header['data_offset'] = 0
+    while True:
+        encoded = json.dumps(header, ensure_ascii=False).encode('utf-8')
+        data_offset = -(-(prefix + len(encoded)) // 64) * 64
+        if header['data_offset'] == data_offset:
+            break
+        header['data_offset'] = data_offset
+    
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(SERIES_STORE_MAGIC)
+            f.write(struct.pack('<Q', len(encoded)))
+            f.write(encoded)
+            f.write(b'\0' * (data_offset - prefix - len(encoded)))
+            for array in arrays:
+                f.write(np.ascontiguousarray(array, dtype='<f8').tobytes())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return len(categories)
+
+
+def _open_series_store(path):
+    """Ouvre le magasin des séries ; None s'il est illisible (l'erreur est signalée une fois par version)"""
+    try:
+        return SeriesStore(path)
+    except Exception as e:
+        print(f"Erreur de lecture du magasin des séries {path}: {str(e)}")
+        return None
+
+
+def get_series_store():
+    """Magasin des séries configuré (rouvert quand le fichier est republié), ou None s'il est absent"""
+    path = app.config['SERIES_STORE']
+    if not path:
+        return None
+    try:
+        version = file_fingerprint(path)
+    except OSError:
+        return None
+    return series_store_cache.get('store', version, lambda: _open_series_store(path))
+
+
+# État du préchargement : statut, temps de chargement par artefact (ms) et erreurs
+warmup_state = {
+    'status': 'disabled',
+    'started_at': None,
+    'finished_at': None,
+    'timings': {},
+    'errors': {}
+}
+
+
+def _timed_load(name, loader, *args):
+    """Exécute un chargement et enregistre sa durée (ou son erreur) dans warmup_state"""
+    start = time.perf_counter()
+    try:
+        loader(*args)
+    except Exception as e:
+        warmup_state['errors'][name] = str(e)
+    finally:
+        warmup_state['timings'][name] = round((time.perf_counter() - start) * 1000, 2)
+
+
+def run_warmup():
+    """Charge les données Excel et tous les modèles en parallèle, puis complète la table de prévisions"""
+    warmup_state.update(status='running', started_at=datetime.now(timezone.utc).isoformat(),
+                        finished_at=None, timings={}, errors={})
+    
+    with ThreadPoolExecutor(max_workers=app.config['WARMUP_WORKERS']) as executor:
+        futures = [executor.submit(_timed_load, DATA_FILE, load_data)]
+        futures += [executor.submit(_timed_load, CATEGORY_MODELS[category], load_model, category)
+                    for category in CATEGORY_MODELS]
+        for future in futures:
+            future.result()
+    
+    build_forecast_table()
+    warmup_state.update(status='ready', finished_at=datetime.now(timezone.utc).isoformat())
+    print(f"Préchargement terminé : {warmup_state['timings']}")
+
+
+def start_warmup():
+    """Lance le préchargement dans un thread d'arrière-plan"""
+    warmup_state['status'] = 'pending'
+    threading.Thread(target=run_warmup, name='warmup', daemon=True).start()
+
+
+# État du rechargement à chaud (mode 'managed')
+reload_state = {
+    'status': 'disabled',
+    'last_check': None,
+    'last_reload': None,
+    'reloads': 0,
+    'reloaded': [],
+    'errors': {}
+}
+_reload_lock = threading.Lock()
+
+
+def _reload_entry(name, cache, key, version, loader):
+    """Charge la nouvelle version d'une entrée hors du cache puis la substitue ; retourne la valeur ou None"""
+    try:
+        value = loader()
+    except Exception as e:
+        # Garder l'ancienne version ; ne pas réessayer une version déjà en échec
+        reload_state['errors'][name] = {'version': version, 'error': str(e)}
+        print(f"Erreur de rechargement de {name}: {str(e)}")
+        return None
+    cache.put(key, version, value)
+    reload_state['errors'].pop(name, None)
+    return value
+
+
+def reload_changed_files():
+    """
+    Recharge en arrière-plan les modèles et les données dont le fichier a changé, puis les substitue
+    atomiquement dans les caches. Les requêtes en cours gardent les objets qu'elles ont déjà obtenus ;
+    les suivantes voient la nouvelle version. Invalide ensuite les caches dérivés (prévisions, figures,
+    valeurs ajustées, états du moteur NumPy). Retourne la liste des fichiers rechargés.
+    """
+    with _reload_lock:
+        reloaded = []
+        
+        # Données Excel (seulement si déjà chargées : sinon le premier accès les chargera)
+        current = data_cache.version('data')
+        try:
+            version = file_fingerprint(DATA_FILE)
+        except OSError as e:
+            reload_state['errors'][DATA_FILE] = {'version': None, 'error': str(e)}
+            version = current
+        failed = reload_state['errors'].get(DATA_FILE, {}).get('version')
+        if current is not None and version != current and version != failed:
+            if _reload_entry(DATA_FILE, data_cache, 'data', version, lambda: _read_data_file(version)) is not None:
+                reloaded.append(DATA_FILE)
+        
+        # Modèles
+        for category in CATEGORY_MODELS:
+            current = model_cache.version(category)
+            if current is None:
+                continue
+            model_path = get_model_path(category)
+            try:
+                version = file_fingerprint(model_path)
+            except OSError as e:
+                reload_state['errors'][model_path] = {'version': None, 'error': str(e)}
+                continue
+            if version == current or version == reload_state['errors'].get(model_path, {}).get('version'):
+                continue
+            
+            model = _reload_entry(model_path, model_cache, category, version, lambda: read_model_file(category))
+            if model is None:
+                continue
+            reloaded.append(model_path)
+            engine_states.discard(category)
+            forecast_origins.discard(category)
+            fitted_cache.discard(category)
+            try:
+                fill_forecast_row(category, model, version)
+            except Exception as e:
+                print(f"Erreur de précalcul des prévisions pour {category}: {str(e)}")
+        
+        if DATA_FILE in reloaded:
+            for category in CATEGORY_MODELS:
+                fitted_cache.discard(category)
+        if reloaded:
+            # Les clés des figures dépendent des versions : libérer les figures devenues inaccessibles
+            clear_figure_cache()
+            reload_state['reloads'] += 1
+            reload_state['last_reload'] = datetime.now(timezone.utc).isoformat()
+            reload_state['reloaded'] = reloaded
+            print(f"Rechargement à chaud : {', '.join(reloaded)}")
+        reload_state['last_check'] = datetime.now(timezone.utc).isoformat()
+        return reloaded
+
+
+def _watch_files():
+    """Boucle de surveillance des fichiers de modèles et de données"""
+    while True:
+        time.sleep(app.config['RELOAD_INTERVAL'])
+        try:
+            reload_changed_files()
+        except Exception as e:
+            print(f"Erreur de la surveillance des fichiers: {str(e)}")
+
+
+def start_file_watcher():
+    """Lance la surveillance des fichiers dans un thread d'arrière-plan (mode 'managed')"""
+    reload_state['status'] = 'watching'
+    threading.Thread(target=_watch_files, name='file-watcher', daemon=True).start()
+
+
+def get_forecast_path(category, steps):
+    """Trajectoire couvrant au moins `steps` trimestres : table précalculée, calcul direct au-delà de l'horizon"""
+    if steps <= FORECAST_TABLE_STEPS:
+        return get_forecast_row(category)
+    model = load_model(category)
+    with stage_timer('forecast', category):
+        return compute_forecast_path(model, steps)
+
+
+def get_forecast_value(category, steps):
+    """Prévision ponctuelle à `steps` trimestres"""
+    return float(get_forecast_path(category, steps)[steps - 1])
+
+
+# Nombre maximal de demandes acceptées par /predict/batch
+BATCH_MAX_ITEMS = 10000
+
+
+def parse_prediction_request(data):
+    """Valide une demande de prédiction et retourne (catégorie, année, trimestre, nombre de trimestres)"""
+    if not isinstance(data, dict):
+        raise ValueError('Demande de prédiction invalide')
     
-    # Section 4: Graphiques en aires
-    area_visualizations = []
+    category = data.get('category')
+    try:
+        year = int(data.get('year'))
+        quarter = int(data.get('quarter'))
+    except (TypeError, ValueError):
+        raise ValueError('Année et trimestre doivent être des entiers')
+    
+    if category not in CATEGORY_MODELS:
+        raise ValueError(f"Catégorie '{category}' non valide")
+    
+    if quarter < 1 or quarter > 4:
+        raise ValueError('Le trimestre doit être entre 1 et 4')
+    
+    # Calculer le nombre de périodes à prédire depuis la fin des données du modèle
+    steps = get_forecast_period(year, quarter, get_forecast_origin(category))
+    check_forecast_horizon(steps)
+    
+    return category, year, quarter, steps
+
+
+def iter_dashboard_categories(df):
+    """
+    Parcourt les catégories du tableau de bord dans l'ordre de la hiérarchie.
+    Retourne (nom, colonne Excel ou None si la figure vient du modèle SARIMA, couleur).
+    """
     for main_cat, info in CATEGORY_HIERARCHY.items():
+        # Catégorie principale avec données Excel
         if info.get('excel_column') and info['excel_column'] in df.columns:
-            plot = generate_area_plot(main_cat, info['excel_column'], info.get('color', '#003366'))
-            if plot:
-                area_visualizations.append({
-                    'name': f'Évolution - {main_cat}',
-                    'image': plot,
-                    'type': 'area'
-                })
+            yield main_cat, info['excel_column'], info.get('color', '#003366')
+        
+        # Sous-catégories : données Excel si disponibles, sinon modèle SARIMA
         if info.get('subcategories'):
             for sub_cat, sub_info in info['subcategories'].items():
                 if sub_info.get('excel_column') and sub_info['excel_column'] in df.columns:
-                    plot = generate_area_plot(sub_cat, sub_info['excel_column'], sub_info.get('color', '#003366'))
-                    if plot:
-                        area_visualizations.append({
-                            'name': f'Évolution - {sub_cat}',
-                            'image': plot,
-                            'type': 'area'
-                        })
+                    yield sub_cat, sub_info['excel_column'], sub_info.get('color', '#003366')
+                elif sub_info.get('model'):
+                    yield sub_cat, None, sub_info.get('color', '#003366')
+
+
+# Pool de processus pour le rendu des figures (créé à la première utilisation)
+_render_executor = None
+_render_executor_lock = threading.Lock()
+
+
+def _init_render_worker():
+    """Initialise un processus de rendu : charge les données Excel et les modèles une fois pour toutes"""
+    # Les processus de rendu suivent directement les fichiers (pas de surveillance propre)
+    app.config['RELOAD_MODE'] = 'auto'
+    load_data()
+    for category in CATEGORY_MODELS:
+        try:
+            load_model(category)
+        except Exception as e:
+            print(f"Erreur de chargement du modèle {category} dans le processus de rendu: {str(e)}")
+
+
+def _refresh_render_worker(func, args):
+    """Recharge dans le processus de rendu les données et modèles d'une figure dont le fichier a changé"""
+    if data_cache.version('data') != get_data_version():
+        load_data()
+    
+    if func.model_scope == 'category':
+        categories = [args[0]]
+    elif func.model_scope == 'all':
+        categories = list(CATEGORY_MODELS)
+    else:
+        categories = []
+    for category in categories:
+        version = _model_version_or_none(category)
+        if version is not None and model_cache.version(category) != version:
+            load_model(category)
+
+
+def _render_figure_job(func_name, args, options=None):
+    """Rend une figure dans un processus de rendu, sans passer par le cache ; retourne (image, durée)"""
+    func = globals()[func_name]
+    _refresh_render_worker(func, args)
+    start = time.perf_counter()
+    image = func.__wrapped__(*args, **(options or {}))
+    return image, time.perf_counter() - start
+
+
+def get_render_executor():
+    """Retourne le pool de processus de rendu, ou None si le rendu parallèle est désactivé"""
+    global _render_executor
+    workers = app.config['DASHBOARD_WORKERS']
+    if workers <= 1:
+        return None
+    with _render_executor_lock:
+        if _render_executor is None:
+            _render_executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_render_worker
+            )
+        return _render_executor
+
+
+def shutdown_render_executor():
+    """Arrête le pool de processus de rendu (il sera recréé à la prochaine utilisation)"""
+    global _render_executor
+    with _render_executor_lock:
+        if _render_executor is not None:
+            _render_executor.shutdown(wait=False, cancel_futures=True)
+            _render_executor = None
+
+
+def render_figures(jobs, **options):
+    """
+    Rend une liste de figures (fonction generate_*, arguments) et retourne les images dans le même ordre.
+    Les figures déjà en cache sont servies directement, les autres sont réparties sur le pool de processus.
+    options (fmt, dpi) s'applique à toutes les figures.
+    """
+    images = [None] * len(jobs)
+    pending = []
+    for i, (func, args) in enumerate(jobs):
+        try:
+            key = func.cache_key(*args, **options)
+        except Exception:
+            key = None
+        image = figure_cache_get(key) if key else None
+        if image is None:
+            pending.append((i, key))
+        else:
+            images[i] = image
+    
+    executor = get_render_executor() if len(pending) > 1 else None
+    if executor is not None:
+        try:
+            futures = [(i, key, executor.submit(_render_figure_job, jobs[i][0].__name__, jobs[i][1], options))
+                       for i, key in pending]
+            for i, key, future in futures:
+                images[i], seconds = future.result()
+                args = jobs[i][1]
+                observe_stage('figure_render', seconds, args[0] if args else 'all')
+                if images[i] is not None and key:
+                    figure_cache_put(key, images[i])
+            return images
+        except Exception as e:
+            print(f"Erreur du pool de rendu, rendu séquentiel: {str(e)}")
+            shutdown_render_executor()
+    
+    # Rendu séquentiel sur le thread de la requête
+    for i, key in pending:
+        if images[i] is None:
+            func, args = jobs[i]
+            with stage_timer('figure_render', args[0] if args else 'all'):
+                images[i] = func.__wrapped__(*args, **options)
+            if images[i] is not None and key:
+                figure_cache_put(key, images[i])
+    return images
+
+
+# Figures servies par /api/plot/<kind>/<category> : type -> (fonction depuis Excel, fonction depuis le modèle)
+CATEGORY_PLOT_KINDS = {
+    'trend': (generate_trend_plot, generate_trend_plot_from_model),
+    'simple': (generate_simple_plot, generate_simple_plot_from_model),
+    'area': (generate_area_plot, None)
+}
+
+# Figures globales servies par /api/plot/<kind>
+GLOBAL_PLOT_KINDS = {
+    'comparison_bar': generate_comparison_bar_chart,
+    'histogram': generate_histogram_plot,
+    'comparison_line': generate_comparison_line_plot
+}
+
+# Formats d'image disponibles
+PLOT_MIMETYPES = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+    'svgz': 'image/svg+xml',
+    'webp': 'image/webp'
+}
+
+# Formats transmis compressés (Content-Encoding) : le navigateur les décompresse avant affichage
+PLOT_CONTENT_ENCODINGS = {'svgz': 'gzip'}
+
+
+def get_plot_url(func, args, fmt='png'):
+    """URL /api/plot d'une figure du tableau de bord"""
+    kind = func.kind[:-len('_model')] if func.kind.endswith('_model') else func.kind
+    params = {} if fmt == 'png' else {'format': fmt}
+    if args:
+        return url_for('plot_image', kind=kind, category=args[0], **params)
+    return url_for('plot_image', kind=kind, **params)
+
+
+# Graphique dessiné par le navigateur (mode 'client') pour chaque type de figure du tableau de bord
+CLIENT_CHART_TYPES = {
+    'trend': 'trend',
+    'trend_model': 'trend',
+    'simple': 'line',
+    'simple_model': 'line',
+    'area': 'area',
+    'comparison_bar': 'bar',
+    'histogram': 'histogram',
+    'comparison_line': 'lines'
+}
+
+# Séries (et couleurs) des figures de comparaison Urbain, Rural et Ensemble
+COMPARISON_SERIES_COLORS = {'Urbain': '#0066CC', 'Rural': '#FF6600', 'Ensemble': '#006233'}
+
+
+def get_chart_spec(func, args, df):
+    """Description d'une figure du tableau de bord pour le rendu par le navigateur (type et séries)"""
+    if args:
+        series = [(args[0], args[-1])]
+    elif func.kind == 'comparison_bar':
+        series = [(name, color) for name, _, color in iter_dashboard_categories(df)]
+    else:
+        series = [(name, color) for name, color in COMPARISON_SERIES_COLORS.items() if name in df.columns]
+    return {
+        'type': CLIENT_CHART_TYPES[func.kind],
+        'series': [{'name': name, 'color': color, 'url': url_for('series_api', category=name)}
+                   for name, color in series]
+    }
+
+
+def resolve_plot(kind, category):
+    """Retourne (fonction generate_*, arguments) d'une figure, ou None si elle n'existe pas"""
+    if category is None:
+        func = GLOBAL_PLOT_KINDS.get(kind)
+        return (func, ()) if func else None
+    
+    if kind not in CATEGORY_PLOT_KINDS:
+        return None
+    from_excel, from_model = CATEGORY_PLOT_KINDS[kind]
+    for name, column, color in iter_dashboard_categories(load_data()):
+        if name != category:
+            continue
+        if column:
+            return from_excel, (name, column, color)
+        if from_model:
+            return from_model, (name, color)
+    return None
+
+
+def get_plot_last_modified(func, args):
+    """Date de dernière modification des fichiers sources d'une figure"""
+    paths = [DATA_FILE]
+    if func.model_scope == 'category':
+        paths.append(get_model_path(args[0]))
+    elif func.model_scope == 'all':
+        paths.extend(get_model_path(category) for category in CATEGORY_MODELS)
+    mtimes = [os.path.getmtime(path) for path in paths if os.path.exists(path)]
+    return datetime.fromtimestamp(int(max(mtimes)), tz=timezone.utc)
+
+
+class ServerBusy(Exception):
+    """Trop de traitements lourds en cours et en attente : la requête est refusée (503)"""
+
+
+class HeavyWorkLimiter:
+    """
+    Admission des traitements lourds : au plus HEAVY_WORKERS en cours, au plus HEAVY_QUEUE_DEPTH en attente
+    (chacun au plus HEAVY_QUEUE_TIMEOUT secondes). Les routes légères ne passent pas par ce limiteur et
+    restent servies par les autres threads du serveur.
+    """
+    
+    def __init__(self):
+        self.running = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._condition = threading.Condition()
+    
+    def acquire(self):
+        """Attend une place ; lève ServerBusy si la file est pleine ou l'attente trop longue. False si désactivé"""
+        workers = app.config['HEAVY_WORKERS']
+        if workers <= 0:
+            return False
+        
+        with self._condition:
+            if self.running >= workers and self.queued >= app.config['HEAVY_QUEUE_DEPTH']:
+                self.rejected += 1
+                raise ServerBusy()
+            
+            self.queued += 1
+            deadline = time.monotonic() + app.config['HEAVY_QUEUE_TIMEOUT']
+            try:
+                while self.running >= workers:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.rejected += 1
+                        raise ServerBusy()
+                    self._condition.wait(remaining)
+            finally:
+                self.queued -= 1
+            self.running += 1
+            self.admitted += 1
+        return True
+    
+    def release(self):
+        """Libère une place"""
+        with self._condition:
+            self.running -= 1
+            self._condition.notify()
+    
+    def snapshot(self):
+        """Compteurs du limiteur"""
+        with self._condition:
+            return {'running': self.running, 'queued': self.queued,
+                    'admitted': self.admitted, 'rejected': self.rejected}
+
+
+heavy_limiter = HeavyWorkLimiter()
+
+# Place déjà obtenue par le thread courant (les traitements lourds imbriqués ne la redemandent pas)
+_heavy_context = threading.local()
+
+
+@contextlib.contextmanager
+def heavy_slot():
+    """Exécute le bloc dans une place du limiteur de traitements lourds (ServerBusy si refusé)"""
+    if getattr(_heavy_context, 'held', False) or not heavy_limiter.acquire():
+        yield
+        return
+    
+    _heavy_context.held = True
+    try:
+        yield
+    finally:
+        _heavy_context.held = False
+        heavy_limiter.release()
+
+
+def heavy_route(predicate=None):
+    """Décorateur de route : la vue passe par le limiteur de traitements lourds (si predicate() est vrai)"""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if predicate is not None and not predicate():
+                return view(*args, **kwargs)
+            with heavy_slot():
+                return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@app.errorhandler(ServerBusy)
+def server_busy(e):
+    """Réponse rapide quand les traitements lourds sont saturés"""
+    response = jsonify({'error': 'Serveur occupé, réessayez plus tard', 'retry_after': app.config['RETRY_AFTER']})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(app.config['RETRY_AFTER'])
+    return response
+
+
+@app.before_request
+def _start_request_timer():
+    """Début de la mesure de la requête"""
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def _observe_request(response):
+    """Enregistre la durée de la requête (jusqu'à l'envoi des en-têtes pour les réponses en flux)"""
+    start = g.pop('request_start', None)
+    if start is not None and app.config['METRICS_ENABLED']:
+        request_histogram.observe(time.perf_counter() - start, current_route(), request.method,
+                                  str(response.status_code))
+    return response
+
+
+# Un seul profilage à la fois (cProfile ne profile qu'un thread et les mesures simultanées se gênent)
+_profile_lock = threading.Lock()
+PROFILE_MODES = ('summary', 'save')
+PROFILE_SORT_KEYS = ('cumulative', 'tottime', 'ncalls')
+
+
+@app.before_request
+def _start_profiler():
+    """Démarre cProfile si le profilage est activé et demandé par X-Profile ou ?profile="""
+    if not app.config['PROFILING_ENABLED']:
+        return
+    mode = request.headers.get('X-Profile') or request.args.get('profile')
+    if not mode:
+        return
+    mode = mode if mode in PROFILE_MODES else 'summary'
+    if not _profile_lock.acquire(blocking=False):
+        g.profile_status = 'busy'
+        return
+    
+    g.profile_mode = mode
+    g.profiler = cProfile.Profile()
+    g.profiler.enable()
+
+
+def _stop_profiler():
+    """Arrête le profilage de la requête en cours et libère le verrou ; retourne le profileur"""
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        _profile_lock.release()
+    return profiler
+
+
+@app.after_request
+def _finish_profiler(response):
+    """
+    Termine le profilage : enregistre le profil (.prof, lisible avec pstats ou snakeviz) dans PROFILE_DIR,
+    ou remplace la réponse par le résumé des fonctions les plus coûteuses
+    """
+    if 'profile_status' in g:
+        response.headers['X-Profile'] = g.profile_status
+    profiler = _stop_profiler()
+    if profiler is None:
+        return response
+    
+    sort = request.args.get('profile_sort', 'cumulative')
+    if sort not in PROFILE_SORT_KEYS:
+        sort = 'cumulative'
+    
+    if g.profile_mode == 'save':
+        profile_dir = app.config['PROFILE_DIR']
+        name = f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{request.endpoint or 'none'}"
+        category = (request.view_args or {}).get('category')
+        if category:
+            name += '-' + ''.join(c if c.isalnum() else '_' for c in category)
+        path = os.path.join(profile_dir, name + '.prof')
+        try:
+            os.makedirs(profile_dir, exist_ok=True)
+            profiler.dump_stats(path)
+            response.headers['X-Profile'] = 'saved'
+            response.headers['X-Profile-File'] = path
+        except OSError as e:
+            print(f"Erreur d'écriture du profil {path}: {str(e)}")
+            response.headers['X-Profile'] = 'error'
+        return response
+    
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats(sort).print_stats(app.config['PROFILE_TOP'])
+    summary = (f"{request.method} {request.full_path} -> {response.status}\n"
+               f"Tri : {sort}, {app.config['PROFILE_TOP']} premières fonctions\n\n{output.getvalue()}")
+    return Response(summary, content_type='text/plain; charset=utf-8', headers={'X-Profile': 'summary'})
+
+
+@app.teardown_request
+def _release_profiler(exc):
+    """Arrête le profilage si la requête s'est terminée sans passer par after_request"""
+    _stop_profiler()
+
+
+@before_render_template.connect_via(app)
+def _start_template_timer(sender, template, context, **extra):
+    """Début de la mesure du rendu d'un gabarit"""
+    _metrics_context.template_start = time.perf_counter()
+
+
+@template_rendered.connect_via(app)
+def _observe_template(sender, template, context, **extra):
+    """Enregistre la durée du rendu d'un gabarit"""
+    start = getattr(_metrics_context, 'template_start', None)
+    if start is not None and app.config['METRICS_ENABLED']:
+        _metrics_context.template_start = None
+        observe_stage('template_render', time.perf_counter() - start, '')
+
+
+# Encodages proposés, par ordre de préférence, et niveaux de compression (réponses précalculées, dynamiques)
+CONTENT_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+STATIC_COMPRESS_LEVELS = {'br': 11, 'gzip': 9}
+DYNAMIC_COMPRESS_LEVELS = {'br': 5, 'gzip': 6}
+# Au-delà de cette taille (octets), une réponse précalculée est compressée aux niveaux dynamiques
+# (le niveau maximal coûterait plusieurs secondes sur les 4 Mo du tableau de bord 'inline')
+STATIC_COMPRESS_MAX_SIZE = 256 * 1024
+
+# Empreinte de la hiérarchie des catégories (fixe pour un déploiement)
+CATEGORY_HIERARCHY_FINGERPRINT = hashlib.sha256(
+    json.dumps(CATEGORY_HIERARCHY, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+# Réponses statiques par version du contenu : clé de la vue -> corps sérialisé et variantes compressées
+static_responses = {}
+
+
+def compress_body(body, encoding, level):
+    """Compresse un corps de réponse avec l'encodage demandé ('br' ou 'gzip')"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def choose_encoding(encodings=CONTENT_ENCODINGS):
+    """Encodage préféré parmi ceux acceptés par le client (en-tête Accept-Encoding), None : aucun"""
+    for encoding in encodings:
+        if request.accept_encodings.quality(encoding) > 0:
+            return encoding
+    return None
+
+
+def get_content_version():
+    """Version du contenu servi : empreinte de CATEGORY_HIERARCHY et des versions du classeur et des modèles"""
+    versions = [CATEGORY_HIERARCHY_FINGERPRINT, get_data_version()]
+    versions += [_model_version_or_none(category) for category in CATEGORY_MODELS]
+    return hashlib.sha256(repr(versions).encode('utf-8')).hexdigest()
+
+
+def static_response(variant=None):
+    """
+    Décorateur des vues dont la réponse ne dépend que de leurs arguments, de variant() et de la version
+    du contenu : le corps est produit et sérialisé une fois par version, compressé à la première demande
+    de chaque encodage, puis servi avec un ETag fort (propre à chaque encodage) et une réponse 304 si
+    If-None-Match correspond. Les réponses autres que 200, et celles que la vue a marquées incomplètes
+    (skip_static_response), ne sont pas conservées.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            version = get_content_version()
+            key = (view.__name__, tuple(sorted(kwargs.items())), variant() if variant else None)
+            entry = static_responses.get(key)
+            if entry is None or entry['version'] != version:
+                response = app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed or g.pop('skip_static_response', False):
+                    return response
+                body = response.get_data()
+                etag = hashlib.sha256(version.encode('utf-8') + body).hexdigest()[:32]
+                entry = {'version': version, 'etag': etag, 'content_type': response.content_type, 'bodies': {None: body}}
+                static_responses[key] = entry
+            
+            encoding = choose_encoding()
+            etag = entry['etag'] if encoding is None else f"{entry['etag']}-{encoding}"
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+            else:
+                bodies = entry['bodies']
+                if encoding not in bodies:
+                    # Compression à la première demande de cet encodage (deux requêtes simultanées peuvent
+                    # la faire chacune : résultat identique)
+                    body = bodies[None]
+                    levels = STATIC_COMPRESS_LEVELS if len(body) <= STATIC_COMPRESS_MAX_SIZE else DYNAMIC_COMPRESS_LEVELS
+                    bodies[encoding] = compress_body(body, encoding, levels[encoding])
+                response = Response(bodies[encoding], content_type=entry['content_type'])
+                if encoding:
+                    response.headers['Content-Encoding'] = encoding
+            response.set_etag(etag)
+            response.vary.add('Accept-Encoding')
+            # Le navigateur revalide à chaque affichage (304 sans corps si rien n'a changé)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
+
+@app.after_request
+def _compress_response(response):
+    """Compresse les réponses JSON dynamiques au-delà de COMPRESS_MIN_SIZE octets si le client l'accepte"""
+    minimum = app.config['COMPRESS_MIN_SIZE']
+    if (minimum <= 0 or response.mimetype != 'application/json' or response.status_code != 200
+            or response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    encoding = choose_encoding()
+    if len(body) < minimum or encoding is None:
+        return response
+    response.set_data(compress_body(body, encoding, DYNAMIC_COMPRESS_LEVELS[encoding]))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+@app.route('/')
+@static_response()
+def home():
+    """Page d'accueil principale"""
+    return render_template('home.html', category_hierarchy=CATEGORY_HIERARCHY)
+
+
+@app.route('/prediction')
+@static_response()
+def index():
+    """Page de prédiction avec le formulaire"""
+    return render_template('index.html', category_hierarchy=CATEGORY_HIERARCHY)
+
+
+@app.route('/about')
+@static_response()
+def about():
+    """Page À propos"""
+    return render_template('about.html')
+
+
+def get_dashboard_jobs(df):
+    """Figures du tableau de bord, dans l'ordre d'affichage : liste de (section, nom, fonction, arguments)"""
+    jobs = []
+    
+    # Section 1: Graphiques de tendance avec moyenne mobile (Excel, sinon modèle SARIMA)
+    for name, column, color in iter_dashboard_categories(df):
+        if column:
+            jobs.append(('tendance', f'Tendance - {name}', generate_trend_plot, (name, column, color)))
+        else:
+            jobs.append(('tendance', f'Tendance - {name}', generate_trend_plot_from_model, (name, color)))
+    
+    # Section 2: Graphiques simples du taux de chômage
+    for name, column, color in iter_dashboard_categories(df):
+        if column:
+            jobs.append(('simple', f'Taux de chômage - {name}', generate_simple_plot, (name, column, color)))
+        else:
+            jobs.append(('simple', f'Taux de chômage - {name}', generate_simple_plot_from_model, (name, color)))
+    
+    # Section 3: Graphique comparatif en barres
+    jobs.append(('comparison_plot', None, generate_comparison_bar_chart, ()))
+    
+    # Section 4: Graphiques en aires (données Excel uniquement)
+    for name, column, color in iter_dashboard_categories(df):
+        if column:
+            jobs.append(('area', f'Évolution - {name}', generate_area_plot, (name, column, color)))
     
     # Section 5: Histogramme de distribution
-    histogram_plot = generate_histogram_plot()
+    jobs.append(('histogram_plot', None, generate_histogram_plot, ()))
     
     # Section 6: Comparaison Urbain/Rural/Ensemble
-    comparison_line_plot = generate_comparison_line_plot()
+    jobs.append(('comparison_line_plot', None, generate_comparison_line_plot, ()))
+    return jobs
+
+
+# Modes de rendu des figures du tableau de bord
+DASHBOARD_MODES = ('url', 'inline', 'client')
+
+
+def get_dashboard_mode():
+    """Mode de rendu du tableau de bord : ?mode= s'il est valide, sinon DASHBOARD_IMAGE_MODE"""
+    mode = request.args.get('mode')
+    return mode if mode in DASHBOARD_MODES else app.config['DASHBOARD_IMAGE_MODE']
+
+
+@app.route('/dashboard')
+@static_response(variant=get_dashboard_mode)
+@heavy_route(lambda: get_dashboard_mode() == 'inline')
+def dashboard():
+    """Tableau de bord avec visualisations"""
+    df = load_data()
+    jobs = get_dashboard_jobs(df)
+    mode = get_dashboard_mode()
+    fmt = app.config['DASHBOARD_IMAGE_FORMAT']
+    if fmt not in PLOT_MIMETYPES:
+        fmt = 'png'
+    
+    if mode == 'inline':
+        # Une image intégrée (data:) ne peut pas être compressée par Content-Encoding
+        if fmt in PLOT_CONTENT_ENCODINGS:
+            fmt = 'svg'
+        images = render_figures([(func, args) for _, _, func, args in jobs], fmt=fmt)
+        sources = [f'data:{PLOT_MIMETYPES[fmt]};base64,{image}' if image else None for image in images]
+        # Page incomplète (rendu en échec) : servie sans être conservée par static_response
+        if None in images:
+            g.skip_static_response = True
+    elif mode == 'client':
+        # Le navigateur dessine chaque figure à partir des séries de /api/series (aucun rendu serveur)
+        sources = [get_chart_spec(func, args, df) for _, _, func, args in jobs]
+    else:
+        # Le navigateur charge chaque figure à la demande (et en parallèle) depuis /api/plot
+        sources = [get_plot_url(func, args, fmt) for _, _, func, args in jobs]
+    
+    # Réassembler les figures par section
+    visualizations = {'tendance': [], 'simple': [], 'area': []}
+    single_plots = {}
+    for (section, name, _, _), src in zip(jobs, sources):
+        if section in visualizations:
+            if src:
+                visualizations[section].append({'name': name, 'src': src, 'type': section})
+        else:
+            single_plots[section] = src
     
     return render_template('dashboard.html', 
-                         trend_visualizations=trend_visualizations,
-                         simple_visualizations=simple_visualizations,
-                         comparison_plot=comparison_plot,
-                         area_visualizations=area_visualizations,
-                         histogram_plot=histogram_plot,
-                         comparison_line_plot=comparison_line_plot)
+                         trend_visualizations=visualizations['tendance'],
+                         simple_visualizations=visualizations['simple'],
+                         comparison_plot=single_plots['comparison_plot'],
+                         area_visualizations=visualizations['area'],
+                         histogram_plot=single_plots['histogram_plot'],
+                         comparison_line_plot=single_plots['comparison_line_plot'],
+                         client_render=mode == 'client')
+
+
+@app.route('/api/plot/<kind>', defaults={'category': None})
+@app.route('/api/plot/<kind>/<category>')
+def plot_image(kind, category):
+    """Image d'une figure (PNG, SVG, SVG compressé ou WebP, ?dpi=) avec en-têtes de cache HTTP et GET conditionnel"""
+    fmt = request.args.get('format', 'png')
+    if fmt not in PLOT_MIMETYPES:
+        return jsonify({'error': f"Format '{fmt}' non supporté ({', '.join(PLOT_MIMETYPES)})"}), 400
+    try:
+        dpi = int(request.args.get('dpi', PLOT_DEFAULT_DPI))
+    except ValueError:
+        dpi = None
+    if dpi is None or not PLOT_MIN_DPI <= dpi <= PLOT_MAX_DPI:
+        return jsonify({'error': f"Résolution non valide (dpi entier entre {PLOT_MIN_DPI} et {PLOT_MAX_DPI})"}), 400
+    
+    plot = resolve_plot(kind, category)
+    if plot is None:
+        return jsonify({'error': 'Figure non trouvée'}), 404
+    func, args = plot
+    
+    # La clé du cache de figures dépend des paramètres et des versions des fichiers sources
+    etag = func.cache_key(*args, fmt=fmt, dpi=dpi)
+    last_modified = get_plot_last_modified(func, args)
+    
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = Response(status=304)
+    else:
+        image = func(*args, fmt=fmt, dpi=dpi)
+        if image is None:
+            return jsonify({'error': 'Impossible de générer la figure'}), 404
+        response = Response(base64.b64decode(image), mimetype=PLOT_MIMETYPES[fmt])
+        if fmt in PLOT_CONTENT_ENCODINGS:
+            response.headers['Content-Encoding'] = PLOT_CONTENT_ENCODINGS[fmt]
+    
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config['PLOT_CACHE_MAX_AGE']
+    response.cache_control.must_revalidate = True
+    return response
+
+
+@app.route('/healthz')
+def healthz():
+    """Sonde de vivacité : le processus répond"""
+    return jsonify({'status': 'ok'})
+
+
+@app.route('/readyz')
+def readyz():
+    """Sonde de disponibilité : 503 tant que le préchargement n'est pas terminé"""
+    ready = warmup_state['status'] in ('ready', 'disabled')
+    return jsonify({
+        'ready': ready,
+        'warmup': warmup_state,
+        'reload': reload_state
+    }), 200 if ready else 503
+
+
+def admin_allowed():
+    """Accès aux routes /admin : jeton ADMIN_TOKEN s'il est configuré, sinon requêtes locales uniquement"""
+    token = app.config['ADMIN_TOKEN']
+    if token:
+        return hmac.compare_digest(request.headers.get('X-Admin-Token', ''), token)
+    return request.remote_addr in ('127.0.0.1', '::1')
+
+
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    """Recharge les modèles et les données dont le fichier a changé, sans redémarrer le processus"""
+    if not admin_allowed():
+        return jsonify({'error': 'Accès refusé'}), 403
+    
+    start = time.perf_counter()
+    reloaded = reload_changed_files()
+    return jsonify({
+        'success': True,
+        'reloaded': reloaded,
+        'duration_ms': round((time.perf_counter() - start) * 1000, 2),
+        'mode': app.config['RELOAD_MODE'],
+        'state': reload_state
+    })
+
+
+@app.route('/api/cache/stats')
+def cache_stats():
+    """Compteurs des caches de modèles, de données et d'empreintes"""
+    return jsonify({
+        'models': model_cache.snapshot(),
+        'data': data_cache.snapshot(),
+        'fingerprints': fingerprint_cache.snapshot()
+    })
+
+
+# Champs de /proc/<pid>/smaps_rollup (en Kio) regroupés en mémoire propre au processus et partagée
+PROCESS_MEMORY_FIELDS = {
+    'rss': ('Rss',),
+    'pss': ('Pss',),
+    'unique': ('Private_Clean', 'Private_Dirty'),
+    'shared': ('Shared_Clean', 'Shared_Dirty')
+}
+
+
+def read_process_memory(pid='self'):
+    """Mémoire d'un processus en octets (rss, pss, unique, shared), lue dans smaps_rollup ; None si indisponible"""
+    fields = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    fields[parts[0].rstrip(':')] = int(parts[1]) * 1024
+    except (OSError, ValueError):
+        return None
+    return {kind: sum(fields.get(name, 0) for name in names) for kind, names in PROCESS_MEMORY_FIELDS.items()}
+
+
+@app.route('/metrics')
+def metrics():
+    """Métriques au format texte Prometheus : histogrammes de latence et compteurs des caches"""
+    caches = {
+        'models': model_cache.snapshot(),
+        'data': data_cache.snapshot(),
+        'fingerprints': fingerprint_cache.snapshot(),
+        'fitted': fitted_cache.snapshot(),
+        'engine_states': engine_states.snapshot(),
+        'origins': forecast_origins.snapshot(),
+        'series_store': series_store_cache.snapshot()
+    }
+    with _figure_cache_lock:
+        caches['figures'] = dict(figure_cache_stats, size=len(figure_cache))
+    
+    lines = stage_histogram.render() + request_histogram.render()
+    heavy = heavy_limiter.snapshot()
+    lines += ['# HELP app_heavy_running Traitements lourds en cours', '# TYPE app_heavy_running gauge',
+              f"app_heavy_running {heavy['running']}",
+              '# HELP app_heavy_queued Traitements lourds en attente', '# TYPE app_heavy_queued gauge',
+              f"app_heavy_queued {heavy['queued']}",
+              '# HELP app_heavy_rejected_total Requêtes refusées (503) faute de place', '# TYPE app_heavy_rejected_total counter',
+              f"app_heavy_rejected_total {heavy['rejected']}"]
+    memory = read_process_memory()
+    if memory:
+        lines += ['# HELP app_process_memory_bytes Mémoire du processus de service (unique : pages privées)',
+                  '# TYPE app_process_memory_bytes gauge']
+        lines += [f'app_process_memory_bytes{{pid="{os.getpid()}",kind="{kind}"}} {value}'
+                  for kind, value in memory.items()]
+    for counter, documentation in (('hits', 'Valeurs servies depuis le cache'),
+                                   ('misses', 'Valeurs absentes ou périmées, chargées'),
+                                   ('waits', 'Attentes du chargement en cours par un autre thread')):
+        lines += [f'# HELP app_cache_{counter}_total {documentation}', f'# TYPE app_cache_{counter}_total counter']
+        lines += [f'app_cache_{counter}_total{{cache="{name}"}} {stats[counter]}'
+                  for name, stats in caches.items() if counter in stats]
+    lines += ['# HELP app_cache_entries Entrées présentes dans le cache', '# TYPE app_cache_entries gauge']
+    lines += [f'app_cache_entries{{cache="{name}"}} {stats["size"]}' for name, stats in caches.items()]
+    return Response('\n'.join(lines) + '\n', content_type='text/plain; version=0.0.4; charset=utf-8')
 
 
 @app.route('/api/categories')
+@static_response()
 def get_categories():
     """API pour récupérer la structure hiérarchique des catégories"""
     return jsonify(CATEGORY_HIERARCHY)
 
 
 @app.route('/api/subcategories/<main_category>')
+@static_response()
 def get_subcategories(main_category):
     """API pour récupérer les sous-catégories d'une catégorie principale"""
     if main_category in CATEGORY_HIERARCHY:
@@ -779,54 +2743,40 @@ def get_subcategories(main_category):
     return jsonify({'error': 'Catégorie non trouvée'}), 404
 
 
+def _is_heavy_prediction():
+    """Prédiction calculée à la demande (moteur autre que la table, ou au-delà de l'horizon de la table)"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return False
+    try:
+        beyond_table = int(data.get('year')) > FORECAST_TABLE_LAST_YEAR
+    except (TypeError, ValueError):
+        beyond_table = False
+    return data.get('engine', 'table') != 'table' or beyond_table
+
+
 @app.route('/predict', methods=['POST'])
+@heavy_route(_is_heavy_prediction)
 def predict():
     """Endpoint pour faire une prédiction"""
     try:
         data = request.get_json()
-        category = data.get('category')
-        year = int(data.get('year'))
-        quarter = int(data.get('quarter'))
+        category, year, quarter, steps = parse_prediction_request(data)
         
-        # Validation
-        if category not in CATEGORY_MODELS:
-            return jsonify({'error': f"Catégorie '{category}' non valide"}), 400
-        
-        if quarter < 1 or quarter > 4:
-            return jsonify({'error': 'Le trimestre doit être entre 1 et 4'}), 400
-        
-        # Charger le modèle
-        model = load_model(category)
+        # Moteur de prévision : table précalculée par défaut
+        engine = data.get('engine', 'table')
+        if engine not in FORECAST_ENGINES:
+            raise ValueError(f"Moteur '{engine}' non valide ({', '.join(FORECAST_ENGINES)})")
         
-        # Calculer le nombre de périodes à prédire
-        steps = get_forecast_period(year, quarter)
-        
-        # Obtenir une prédiction selon le type de modèle
+        # Le modèle n'est chargé que s'il faut calculer la prévision (l'existence de son fichier est
+        # vérifiée par parse_prediction_request ; la table peut être servie par le magasin des séries)
         try:
-            def extract_prediction_value(result):
-                """Extrait la dernière valeur d'une prédiction (pandas Series ou numpy array)"""
-                if hasattr(result, 'iloc'):
-                    return float(result.iloc[-1])
-                elif hasattr(result, '__getitem__'):
-                    return float(result[-1])
-                else:
-                    return float(result)
-            
-            # Méthode 1: get_forecast() pour statsmodels SARIMAX (recommandé)
-            if hasattr(model, 'get_forecast'):
-                forecast_result = model.get_forecast(steps=steps)
-                predicted_mean = forecast_result.predicted_mean
-                prediction = extract_prediction_value(predicted_mean)
-            # Méthode 2: forecast() pour statsmodels SARIMAX
-            elif hasattr(model, 'forecast'):
-                forecast = model.forecast(steps=steps)
-                prediction = extract_prediction_value(forecast)
-            # Méthode 3: predict() générique
-            elif hasattr(model, 'predict'):
-                pred = model.predict(steps=steps)
-                prediction = extract_prediction_value(pred)
+            if engine == 'table':
+                prediction = get_forecast_value(category, steps)
             else:
-                raise AttributeError("Le modèle ne possède aucune méthode de prédiction connue")
+                prediction = float(compute_category_forecast_path(category, steps, engine)[steps - 1])
+        except ServerBusy:
+            raise
         except Exception as e:
             return jsonify({
                 'error': f'Erreur lors de la prédiction: {str(e)}',
@@ -838,9 +2788,126 @@ def predict():
             'category': category,
             'year': year,
             'quarter': quarter_names[quarter],
-            'prediction': round(prediction, 2)
+            'prediction': round(prediction, 2),
+            'engine': engine
         })
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except FileNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+    except ServerBusy:
+        raise
+    except Exception as e:
+        return jsonify({'error': f'Erreur serveur: {str(e)}'}), 500
+
+
+@app.route('/predict/batch', methods=['POST'])
+@heavy_route()
+def predict_batch():
+    """Endpoint pour faire plusieurs prédictions : une seule prévision par catégorie, erreurs par demande"""
+    data = request.get_json(silent=True)
+    items = data.get('items') if isinstance(data, dict) else data
+    
+    if not isinstance(items, list):
+        return jsonify({'error': "Le corps doit contenir une liste 'items' de demandes"}), 400
+    
+    if len(items) > BATCH_MAX_ITEMS:
+        return jsonify({'error': f'Trop de demandes ({len(items)}), maximum {BATCH_MAX_ITEMS}'}), 400
+    
+    results = [None] * len(items)
+    
+    # Valider chaque demande et les regrouper par catégorie
+    groups = {}
+    for i, item in enumerate(items):
+        try:
+            category, year, quarter, steps = parse_prediction_request(item)
+        except Exception as e:
+            results[i] = {'index': i, 'success': False, 'error': str(e)}
+            continue
+        groups.setdefault(category, []).append((i, year, quarter, steps))
+    
+    # Une seule trajectoire par catégorie, jusqu'à l'horizon le plus lointain demandé
+    for category, group in groups.items():
+        try:
+            path = get_forecast_path(category, max(steps for _, _, _, steps in group))
+        except Exception as e:
+            for i, _, _, _ in group:
+                results[i] = {'index': i, 'success': False, 'error': f'Erreur lors de la prédiction: {str(e)}'}
+            continue
+        
+        for i, year, quarter, steps in group:
+            results[i] = {
+                'index': i,
+                'success': True,
+                'category': category,
+                'year': year,
+                'quarter': quarter_names[quarter],
+                'prediction': round(float(path[steps - 1]), 2)
+            }
+    
+    return jsonify({
+        'success': True,
+        'count': len(results),
+        'errors': sum(1 for r in results if not r['success']),
+        'results': results
+    })
+
+
+
+
+@app.route('/api/forecast/<category>')
+@heavy_route()
+def forecast_range(category):
+    """
+    Trajectoire des prévisions d'une catégorie entre deux trimestres (?from=2026T1&to=2030T4&alpha=0.05),
+    avec ses intervalles de confiance, calculée par un seul get_forecast. Réponse JSON en colonnes,
+    ou binaire avec ?format=binary (float64 little-endian : moyennes, bornes basses puis bornes hautes).
+    """
+    if category not in CATEGORY_MODELS:
+        return jsonify({'error': f"Catégorie '{category}' non trouvée"}), 404
+    
+    try:
+        start_index, end_index, alpha = parse_forecast_range(request.args.get('from'), request.args.get('to'),
+                                                             request.args.get('alpha'))
+        fmt = request.args.get('format', 'json')
+        if fmt not in ('json', 'binary'):
+            raise ValueError(f"Format '{fmt}' non valide (json, binary)")
+        
+        origin, start, end = get_forecast_steps(category, start_index, end_index)
+        model = load_model(category)
+        try:
+            with stage_timer('forecast', category):
+                mean, lower, upper = compute_forecast_interval(model, end, alpha)
+        except Exception as e:
+            return jsonify({'error': f'Erreur lors de la prédiction: {str(e)}'}), 500
+        mean, lower, upper = mean[start - 1:], lower[start - 1:], upper[start - 1:]
+        
+        start_label, end_label = format_quarter_index(origin + start), format_quarter_index(origin + end)
+        if fmt == 'binary':
+            body = np.concatenate([mean, lower, upper]).astype('<f8').tobytes()
+            response = Response(body, mimetype='application/octet-stream')
+            response.headers['X-Forecast-From'] = start_label
+            response.headers['X-Forecast-To'] = end_label
+            response.headers['X-Forecast-Steps'] = str(len(mean))
+            response.headers['X-Forecast-Alpha'] = str(alpha)
+            response.headers['X-Forecast-Last-Observed'] = format_quarter_index(origin)
+            return response
+        
+        quarters = [format_quarter_index(origin + steps) for steps in range(start, end + 1)]
+        return jsonify({
+            'success': True,
+            'category': category,
+            'last_observed': format_quarter_index(origin),
+            'from': start_label,
+            'to': end_label,
+            'alpha': alpha,
+            'quarters': quarters,
+            'mean': np.round(mean, 4).tolist(),
+            'lower': np.round(lower, 4).tolist(),
+            'upper': np.round(upper, 4).tolist()
+        })
+    
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
     except FileNotFoundError as e:
@@ -849,5 +2916,679 @@ def predict():
         return jsonify({'error': f'Erreur serveur: {str(e)}'}), 500
 
 
+def series_to_json(values):
+    """Tableau de valeurs en liste JSON compacte (4 décimales, NaN -> null)"""
+    rounded = np.round(np.asarray(values, dtype=float), 4)
+    return [None if np.isnan(value) else value for value in rounded.tolist()]
+
+
+def get_observed_series(category):
+    """
+    Trimestres du classeur et valeurs observées d'une catégorie (None si elle n'a pas de colonne),
+    lus dans le magasin des séries s'il correspond au classeur actuel.
+    """
+    store = get_series_store()
+    if store is not None and category in store.categories and store.header['data_version'] == get_data_version():
+        values = store.array(category, 'history')
+        return store.quarters, values if len(values) else None
+    
+    df = load_data()
+    quarters = df['Trimestre'].to_numpy(dtype=str)
+    column = CATEGORY_EXCEL_COLUMNS.get(category)
+    if column not in df.columns:
+        return quarters, None
+    return quarters, df[column].to_numpy(dtype=float)
+
+
+@app.route('/api/series/<category>')
+@heavy_route(lambda: 'forecast' in request.args)
+def series_api(category):
+    """
+    Séries d'une catégorie pour le rendu des graphiques par le navigateur : valeurs observées (classeur),
+    valeurs ajustées du modèle, moyenne mobile centrée sur 4 trimestres (de la série observée, sinon de la
+    série ajustée) et, avec ?forecast=2030T4 (&alpha=0.05), prévisions et intervalles de confiance.
+    Les tableaux sont alignés sur `quarters` ; les valeurs manquantes valent null.
+    """
+    try:
+        if category not in CATEGORY_MODELS:
+            return jsonify({'error': f"Catégorie '{category}' non trouvée"}), 404
+        
+        quarters, observed = get_observed_series(category)
+        fitted = get_fitted_series(category)
+        if fitted is not None and len(fitted.quarters) > len(quarters):
+            quarters = fitted.quarters
+        
+        if observed is not None:
+            trend = pd.Series(observed).rolling(window=4, center=True).mean().to_numpy()
+        elif fitted is not None:
+            trend = fitted.trend
+        else:
+            trend = None
+        
+        color = next((color for name, _, color in iter_dashboard_categories(load_data()) if name == category),
+                     '#003366')
+        origin = get_forecast_origin(category)
+        result = {
+            'success': True,
+            'category': category,
+            'color': color,
+            'source': 'excel' if observed is not None else 'model',
+            'last_observed': format_quarter_index(origin),
+            'quarters': [str(label).strip() for label in quarters],
+            'observed': series_to_json(observed) if observed is not None else None,
+            'fitted': series_to_json(fitted.values) if fitted is not None else None,
+            'trend': series_to_json(trend) if trend is not None else None
+        }
+        
+        if 'forecast' in request.args:
+            _, end_index, alpha = parse_forecast_range(None, request.args.get('forecast'), request.args.get('alpha'))
+            origin, start, end = get_forecast_steps(category, None, end_index)
+            model = load_model(category)
+            with stage_timer('forecast', category):
+                mean, lower, upper = compute_forecast_interval(model, end, alpha)
+            result['forecast'] = {
+                'alpha': alpha,
+                'quarters': [format_quarter_index(origin + steps) for steps in range(start, end + 1)],
+                'mean': series_to_json(mean),
+                'lower': series_to_json(lower),
+                'upper': series_to_json(upper)
+            }
+        return jsonify(result)
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except FileNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': f'Erreur serveur: {str(e)}'}), 500
+
+
+# Formats de l'export en flux et colonnes de chaque ligne
+EXPORT_FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+EXPORT_COLUMNS = ['category', 'quarter', 'steps', 'mean', 'lower', 'upper']
+
+
+def iter_forecast_export(start_index, end_index, alpha=0.05, fmt='ndjson', categories=None):
+    """
+    Génère l'export des prévisions (trimestres absolus, voir parse_forecast_range) de toutes les catégories,
+    un bloc de texte par catégorie : une seule trajectoire est en mémoire à la fois et le premier bloc
+    part aussitôt. Chaque catégorie est prévue depuis la fin des données de son propre modèle.
+    """
+    if fmt == 'csv':
+        yield ','.join(EXPORT_COLUMNS) + '\r\n'
+    
+    for category in categories or CATEGORY_MODELS:
+        try:
+            origin, start, end = get_forecast_steps(category, start_index, end_index)
+            model = load_model(category)
+            with stage_timer('forecast', category):
+                mean, lower, upper = compute_forecast_interval(model, end, alpha)
+        except Exception as e:
+            print(f"Erreur dans iter_forecast_export pour {category}: {str(e)}")
+            if fmt == 'ndjson':
+                yield json.dumps({'category': category, 'error': str(e)}, ensure_ascii=False) + '\n'
+            continue
+        
+        quarters = [format_quarter_index(origin + steps) for steps in range(start, end + 1)]
+        rows = zip(quarters, range(start, end + 1), mean[start - 1:], lower[start - 1:], upper[start - 1:])
+        if fmt == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for quarter, steps, m, lo, up in rows:
+                writer.writerow([category, quarter, steps, round(float(m), 4), round(float(lo), 4), round(float(up), 4)])
+            yield buffer.getvalue()
+        else:
+            yield ''.join(json.dumps(dict(zip(EXPORT_COLUMNS, [category, quarter, steps, round(float(m), 4),
+                                                                round(float(lo), 4), round(float(up), 4)])),
+                                     ensure_ascii=False) + '\n'
+                          for quarter, steps, m, lo, up in rows)
+
+
+def gzip_chunks(chunks, level=6):
+    """Compresse au format gzip un flux de blocs de texte, en vidant le compresseur après chaque bloc"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8')) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+@app.route('/api/export')
+def export_forecasts():
+    """
+    Export en flux des prévisions de toutes les catégories (?format=ndjson|csv&from=2026T1&to=2050T4&alpha=0.05),
+    compressé en gzip si le client l'accepte (Accept-Encoding) ou avec ?gzip=1
+    """
+    try:
+        start_index, end_index, alpha = parse_forecast_range(request.args.get('from'), request.args.get('to'),
+                                                             request.args.get('alpha'))
+        fmt = request.args.get('format', 'ndjson')
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Format '{fmt}' non valide ({', '.join(EXPORT_FORMATS)})")
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # La place du limiteur est gardée jusqu'à la fin de l'envoi du flux ; elle est rendue tout de suite
+    # si la réponse ne peut pas être construite
+    limited = heavy_limiter.acquire()
+    try:
+        chunks = stream_with_context(iter_forecast_export(start_index, end_index, alpha, fmt))
+        use_gzip = request.args.get('gzip') == '1' or 'gzip' in request.accept_encodings
+        response = Response(gzip_chunks(chunks) if use_gzip else chunks, mimetype=EXPORT_FORMATS[fmt])
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+        response.headers['Vary'] = 'Accept-Encoding'
+        start_label = format_quarter_index(start_index) if start_index is not None else 'origine'
+        response.headers['Content-Disposition'] = (
+            f'attachment; filename=previsions_{start_label}_{format_quarter_index(end_index)}.{fmt}')
+    except Exception:
+        if limited:
+            heavy_limiter.release()
+        raise
+    if limited:
+        response.call_on_close(heavy_limiter.release)
+    return response
+
+
+@app.cli.command('export-compact-models')
+def export_compact_models_command():
+    """Exporte chaque sarima_*.pkl au format compact et compare tailles, temps de chargement et prévisions"""
+    print(f"{'Catégorie':<18}{'pkl (o)':>10}{'pkl (ms)':>10}{'npz (o)':>10}{'npz (ms)':>10}{'écart max':>12}")
+    for category in CATEGORY_MODELS:
+        model_path = get_model_file(category)
+        if not os.path.exists(model_path):
+            print(f"{category:<18}modèle '{model_path}' non trouvé")
+            continue
+        
+        start = time.perf_counter()
+        with open(model_path, 'rb') as f:
+            results = pickle.load(f)
+        pickle_ms = (time.perf_counter() - start) * 1000
+        
+        compact_path = get_compact_model_path(model_path)
+        export_compact_model(results, compact_path)
+        
+        start = time.perf_counter()
+        compact = load_compact_model(compact_path)
+        compact_ms = (time.perf_counter() - start) * 1000
+        
+        steps = FORECAST_TABLE_STEPS
+        max_diff = np.max(np.abs(compute_forecast_path(results, steps) - compute_forecast_path(compact, steps)))
+        print(f"{category:<18}{os.path.getsize(model_path):>10}{pickle_ms:>10.1f}"
+              f"{os.path.getsize(compact_path):>10}{compact_ms:>10.1f}{max_diff:>12.2e}")
+
+
+@app.cli.command('check-engine')
+def check_engine_command():
+    """Compare le moteur NumPy à get_forecast().predicted_mean pour chaque sarima_*.pkl livré"""
+    tolerance = 1e-8
+    categories, states, references = [], [], []
+    for category in CATEGORY_MODELS:
+        model_path = get_model_file(category)
+        with open(model_path, 'rb') as f:
+            results = pickle.load(f)
+        categories.append(category)
+        states.append(extract_engine_state(results))
+        references.append(np.asarray(results.get_forecast(steps=FORECAST_TABLE_STEPS).predicted_mean, dtype=float))
+    
+    # Toutes les catégories en une seule opération empilée
+    paths = numpy_forecast_paths(states, FORECAST_TABLE_STEPS)
+    failures = 0
+    for category, path, reference in zip(categories, paths, references):
+        max_diff = float(np.max(np.abs(path - reference)))
+        status = 'OK' if max_diff <= tolerance else 'ÉCHEC'
+        failures += status != 'OK'
+        print(f"{category:<18}{max_diff:>12.2e}  {status}")
+    
+    if failures:
+        raise SystemExit(1)
+
+
+# Préchargement au démarrage (processus principal uniquement, pas dans les processus de rendu)
+def start_background_tasks():
+    """Lance le préchargement (WARMUP_ON_START) et la surveillance des fichiers (mode 'managed')"""
+    if app.config['WARMUP_ON_START']:
+        start_warmup()
+    if app.config['RELOAD_MODE'] == 'managed':
+        if app.config['RELOAD_INTERVAL'] > 0:
+            start_file_watcher()
+        else:
+            reload_state['status'] = 'manual'
+
+
+# Processus principal uniquement (pas dans les processus de rendu, ni dans le maître de serve.py)
+if multiprocessing.parent_process() is None and not app.config['PREFORK']:
+    start_background_tasks()
+
+
+@app.cli.command('rebuild-data-cache')
+def rebuild_data_cache_command():
+    """Réimporte le classeur Excel et reconstruit le cache colonnaire"""
+    cache_path = get_data_cache_path(get_data_version())
+    if not cache_path:
+        print("Cache de données désactivé (DATA_CACHE_DIR vide)")
+        return
+    df = _import_workbook()
+    write_data_cache(df, cache_path)
+    print(f"Cache de données écrit : {cache_path} ({len(df)} lignes, {os.path.getsize(cache_path)} o)")
+
+
+@app.cli.command('build-series-store')
+@click.option('--output', '-o', default=None, help='Fichier du magasin (défaut : SERIES_STORE)')
+def build_series_store_command(output):
+    """Construit et publie (renommage atomique) le magasin des séries partagé par les processus"""
+    path = output or app.config['SERIES_STORE']
+    if not path:
+        raise click.UsageError("Indiquer --output ou définir SERIES_STORE")
+    start = time.perf_counter()
+    count = write_series_store(path)
+    print(f"Magasin des séries écrit : {path} ({count} catégories, {os.path.getsize(path)} o, "
+          f"{time.perf_counter() - start:.2f} s)")
+
+
+@app.cli.command('export-forecasts')
+@click.option('--format', 'fmt', type=click.Choice(list(EXPORT_FORMATS)), default='ndjson', help="Format de l'export")
+@click.option('--from', 'start_label', default=None, help='Premier trimestre (AAAATq, défaut : premier trimestre prévu)')
+@click.option('--to', 'end_label', default=None, help='Dernier trimestre (AAAATq, défaut : T4 2050)')
+@click.option('--alpha', default=0.05, help='Niveau des intervalles de confiance')
+@click.option('--output', '-o', default='-', help='Fichier de sortie (- : sortie standard)')
+@click.option('--gzip', 'use_gzip', is_flag=True, help='Compresser la sortie en gzip')
+def export_forecasts_command(fmt, start_label, end_label, alpha, output, use_gzip):
+    """Exporte en flux les prévisions de toutes les catégories (NDJSON ou CSV)"""
+    try:
+        start_index, end_index, alpha = parse_forecast_range(start_label, end_label, alpha)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    
+    chunks = iter_forecast_export(start_index, end_index, alpha, fmt)
+    chunks = gzip_chunks(chunks) if use_gzip else (chunk.encode('utf-8') for chunk in chunks)
+    out = sys.stdout.buffer if output == '-' else open(output, 'wb')
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+            out.flush()
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+
+def load_observations(path=None):
+    """
+    Observations publiées par catégorie : catégorie -> Series (indice absolu de trimestre -> valeur).
+    Sources : les colonnes du classeur Excel, puis un CSV optionnel (colonne 'Trimestre' au format
+    AAAATq et une colonne par catégorie) qui complète ou remplace le classeur.
+    """
+    observations = {}
+    frames = [(load_data(), {column: category for category, column in CATEGORY_EXCEL_COLUMNS.items()})]
+    if path:
+        extra = pd.read_csv(path)
+        frames.append((extra, {column: column for column in extra.columns if column in CATEGORY_MODELS}))
+    
+    for df, columns in frames:
+        index = [quarter_index(*parse_quarter_label(str(label))) for label in df['Trimestre']]
+        for column, category in columns.items():
+            if column not in df.columns:
+                continue
+            series = pd.Series(pd.to_numeric(df[column], errors='coerce').to_numpy(), index=index).dropna()
+            if category in observations:
+                series = series.combine_first(observations[category])
+            observations[category] = series.sort_index()
+    return observations
+
+
+def get_new_observations(model, series):
+    """Observations postérieures au dernier trimestre du modèle, sans trou (s'arrête au premier manquant)"""
+    values = []
+    index = get_model_origin(model) + 1
+    while index in series.index:
+        values.append(float(series[index]))
+        index += 1
+    return np.array(values)
+
+
+def get_revised_observations(model, series, tolerance=1e-6):
+    """Nombre de trimestres déjà appris par le modèle dont la valeur publiée a été révisée depuis"""
+    endog = np.asarray(model.model.endog, dtype=float).ravel()
+    first = quarter_index(DATA_START_YEAR, DATA_START_QUARTER)
+    overlap = series[(series.index >= first) & (series.index < first + len(endog))]
+    known = endog[overlap.index.to_numpy() - first]
+    return int(np.sum(np.abs(known - overlap.to_numpy()) > tolerance))
+
+
+@app.cli.command('update-models')
+@click.option('--observations', 'observations_path', default=None,
+              help="CSV de nouvelles observations (Trimestre + une colonne par catégorie), en plus du classeur")
+@click.option('--category', 'categories', multiple=True, help='Catégorie à mettre à jour (défaut : toutes)')
+@click.option('--dry-run', is_flag=True, help="Afficher les mises à jour sans écrire les modèles")
+def update_models_command(observations_path, categories, dry_run):
+    """
+    Ajoute les trimestres publiés après la fin des données de chaque modèle par filtrage de Kalman
+    (append, refit=False) : paramètres inchangés, nouveaux fichiers écrits de façon atomique.
+    """
+    observations = load_observations(observations_path)
+    updated_any = False
+    print(f"{'Catégorie':<18}{'avant':>8}{'après':>8}{'ajoutés':>9}{'ms':>9}")
+    for category in categories or CATEGORY_MODELS:
+        if category not in CATEGORY_MODELS:
+            print(f"{category:<18}catégorie non trouvée")
+            continue
+        if category not in observations:
+            print(f"{category:<18}aucune observation publiée (ni classeur, ni --observations)")
+            continue
+        
+        model_path = get_model_file(category)
+        with open(model_path, 'rb') as f:
+            results = pickle.load(f)
+        series = observations[category]
+        before = get_model_origin(results)
+        
+        revised = get_revised_observations(results, series)
+        if revised:
+            print(f"{category:<18}attention : {revised} trimestre(s) déjà appris ont été révisés, "
+                  f"un réajustement complet est recommandé")
+        
+        new_values = get_new_observations(results, series)
+        if not len(new_values):
+            print(f"{category:<18}{format_quarter_index(before):>8}{'':>8}{0:>9}   à jour")
+            continue
+        
+        start = time.perf_counter()
+        updated = results.append(new_values, refit=False)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"{category:<18}{format_quarter_index(before):>8}{format_quarter_index(get_model_origin(updated)):>8}"
+              f"{len(new_values):>9}{elapsed_ms:>9.1f}")
+        
+        if dry_run:
+            continue
+        write_model_file(updated, model_path)
+        compact_path = get_compact_model_path(model_path)
+        if os.path.exists(compact_path):
+            export_compact_model(updated, compact_path)
+        updated_any = True
+    
+    # Republier le magasin des séries avec les nouveaux modèles
+    if app.config['SERIES_STORE'] and updated_any:
+        count = write_series_store(app.config['SERIES_STORE'])
+        print(f"Magasin des séries republié : {app.config['SERIES_STORE']} ({count} catégories)")
+
+
+# Ordre des modèles livrés, point de départ de la recherche d'ordres
+DEFAULT_SARIMA_ORDER = ((1, 1, 1), (1, 1, 1, 4))
+# Nombre minimal d'observations (après différenciation) par paramètre estimé d'un candidat
+TRAIN_MIN_OBS_PER_PARAM = 8
+
+
+def get_training_series(category, observations):
+    """
+    Série d'entraînement d'une catégorie, depuis T1 2006 : observations publiées (classeur, CSV), complétées
+    par les données enregistrées dans le modèle actuel pour les catégories absentes du classeur.
+    Retourne (valeurs, ordre et ordre saisonnier du modèle actuel, paramètres du modèle actuel).
+    """
+    first = quarter_index(DATA_START_YEAR, DATA_START_QUARTER)
+    series = observations.get(category, pd.Series(dtype=float))
+    order, params = DEFAULT_SARIMA_ORDER, None
+    
+    model_path = get_model_file(category)
+    if os.path.exists(model_path):
+        with open(model_path, 'rb') as f:
+            current = pickle.load(f)
+        endog = np.asarray(current.model.endog, dtype=float).ravel()
+        series = series.combine_first(pd.Series(endog, index=range(first, first + len(endog))))
+        init_kwds = current.model._get_init_kwds()
+        order = (tuple(init_kwds['order']), tuple(init_kwds['seasonal_order']))
+        params = dict(zip(current.model.param_names, np.asarray(current.params, dtype=float).tolist()))
+    
+    # Série contiguë depuis le début des données (l'origine des prévisions en dépend)
+    values = []
+    index = first
+    while index in series.index:
+        values.append(float(series[index]))
+        index += 1
+    return np.array(values), order, params
+
+
+def iter_sarima_orders(max_p=2, max_q=2, max_P=1, max_Q=1, d_values=(1,), D_values=(1,), season=4):
+    """Candidats ((p, d, q), (P, D, Q, s)) de la recherche d'ordres"""
+    for p, d, q, P, D, Q in itertools.product(range(max_p + 1), d_values, range(max_q + 1),
+                                              range(max_P + 1), D_values, range(max_Q + 1)):
+        yield (p, d, q), (P, D, Q, season)
+
+
+def sarima_has_enough_data(n_obs, order, seasonal_order, holdout=0):
+    """Élagage a priori : assez d'observations différenciées par paramètre estimé"""
+    (p, d, q), (P, D, Q, s) = order, seasonal_order
+    n_params = p + q + P + Q + 1
+    return n_obs - holdout - d - D * s >= TRAIN_MIN_OBS_PER_PARAM * n_params
+
+
+def _warm_start_params(param_names, known):
+    """Paramètres initiaux : valeurs connues (même nom) d'un ajustement voisin, 0 pour les termes nouveaux"""
+    if not known or 'sigma2' not in known:
+        return None
+    return np.array([known.get(name, 0.0) for name in param_names])
+
+
+def _fit_sarima(values, order, seasonal_order, start_params=None, maxiter=50, holdout=0, path=None):
+    """
+    Ajuste un SARIMA (exécuté dans un processus du pool d'entraînement). Avec `holdout`, ajuste sur la série
+    sans ses `holdout` derniers trimestres et mesure l'erreur de prévision sur ceux-ci. Avec `path`,
+    enregistre le modèle ajusté. Retourne ordres, scores, paramètres et durée.
+    """
+    import warnings
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+    
+    start = time.perf_counter()
+    result = {'order': order, 'seasonal_order': seasonal_order}
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        try:
+            train = values[:-holdout] if holdout else values
+            model = SARIMAX(train, order=order, seasonal_order=seasonal_order)
+            fitted = model.fit(start_params=_warm_start_params(model.param_names, start_params),
+                               disp=False, maxiter=maxiter)
+            result.update(
+                aic=float(fitted.aic),
+                bic=float(fitted.bic),
+                converged=bool(fitted.mle_retvals.get('converged', True)),
+                params=dict(zip(model.param_names, np.asarray(fitted.params, dtype=float).tolist()))
+            )
+            if holdout:
+                forecast = np.asarray(fitted.forecast(holdout), dtype=float)
+                result['holdout_rmse'] = float(np.sqrt(np.mean((forecast - values[-holdout:]) ** 2)))
+            if path:
+                write_model_file(fitted, path)
+            if not np.isfinite(result['aic']):
+                result['error'] = 'AIC non fini'
+            # Racines à la limite du cercle unité : ajustement dégénéré, prévisions non fiables
+            roots = np.concatenate([np.atleast_1d(fitted.arroots), np.atleast_1d(fitted.maroots)])
+            if roots.size and np.min(np.abs(roots)) < 1.001:
+                result['error'] = 'racines à la limite de la stationnarité ou de l\'inversibilité'
+        except Exception as e:
+            result['error'] = str(e)
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def _run_fits(executor, tasks):
+    """Soumet des ajustements (clé, arguments de _fit_sarima) au pool et retourne {clé: résultat}"""
+    futures = {key: executor.submit(_fit_sarima, *args) for key, args in tasks}
+    return {key: future.result() for key, future in futures.items()}
+
+
+def _rank_key(metric):
+    """Clé de tri des candidats : AIC ou erreur de prévision sur l'échantillon de validation"""
+    return lambda fit: fit.get('holdout_rmse' if metric == 'holdout' else 'aic', np.inf)
+
+
+def install_model_file(source, path):
+    """Remplace un modèle servi par un autre fichier (copie atomique), et régénère son artefact compact s'il existe"""
+    tmp_path = f"{path}.tmp"
+    try:
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    
+    compact_path = get_compact_model_path(path)
+    if os.path.exists(compact_path):
+        with open(path, 'rb') as f:
+            export_compact_model(pickle.load(f), compact_path)
+
+
+@app.cli.command('train-models')
+@click.option('--category', 'categories', multiple=True, help='Catégorie à réentraîner (défaut : toutes)')
+@click.option('--observations', 'observations_path', default=None,
+              help='CSV de nouvelles observations (Trimestre + une colonne par catégorie), en plus du classeur')
+@click.option('--metric', type=click.Choice(['aic', 'holdout']), default='aic', help='Critère de choix du modèle')
+@click.option('--holdout', default=8, help='Trimestres de validation pour --metric holdout')
+@click.option('--max-p', default=2, help='Ordre AR maximal')
+@click.option('--max-q', default=2, help='Ordre MA maximal')
+@click.option('--max-seasonal-p', 'max_P', default=1, help='Ordre AR saisonnier maximal')
+@click.option('--max-seasonal-q', 'max_Q', default=1, help='Ordre MA saisonnier maximal')
+@click.option('--d', 'd_values', default='1', help='Ordres de différenciation essayés (ex. 0,1)')
+@click.option('--seasonal-d', 'D_values', default='1', help='Ordres de différenciation saisonnière essayés (ex. 0,1)')
+@click.option('--quick-iter', default=30, help='Itérations du premier passage (élagage)')
+@click.option('--keep', default=3, help='Candidats gardés par catégorie pour l\'ajustement complet')
+@click.option('--workers', default=os.cpu_count() or 1, help='Processus du pool d\'entraînement')
+@click.option('--output-dir', default='models', help='Répertoire des versions de modèles')
+@click.option('--install', is_flag=True, help='Installer les modèles choisis à la place des modèles servis')
+def train_models_command(categories, observations_path, metric, holdout, max_p, max_q, max_P, max_Q,
+                         d_values, D_values, quick_iter, keep, workers, output_dir, install):
+    """
+    Réentraîne les modèles SARIMA : recherche d'ordres (p,d,q)(P,D,Q,4) répartie sur un pool de processus,
+    paramètres initiaux repris des modèles actuels, élagage après un premier passage court, puis
+    classement par AIC ou erreur de validation. Écrit une version datée dans --output-dir.
+    """
+    categories = list(categories or CATEGORY_MODELS)
+    unknown = [category for category in categories if category not in CATEGORY_MODELS]
+    if unknown:
+        raise click.BadParameter(f"Catégorie(s) inconnue(s) : {', '.join(unknown)}")
+    d_values = tuple(int(v) for v in d_values.split(','))
+    D_values = tuple(int(v) for v in D_values.split(','))
+    holdout = holdout if metric == 'holdout' else 0
+    full_iter = 200
+    
+    observations = load_observations(observations_path)
+    series, baselines, current_params = {}, {}, {}
+    for category in categories:
+        series[category], baselines[category], current_params[category] = get_training_series(category, observations)
+        print(f"{category:<18}{len(series[category])} trimestres jusqu'à "
+              f"{format_quarter_index(quarter_index(DATA_START_YEAR, DATA_START_QUARTER) + len(series[category]) - 1)}")
+    
+    version = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    version_dir = os.path.join(output_dir, version)
+    os.makedirs(version_dir, exist_ok=True)
+    started = time.perf_counter()
+    
+    with ProcessPoolExecutor(max_workers=max(1, workers), mp_context=multiprocessing.get_context('spawn')) as executor:
+        # 1. Ordre actuel de chaque catégorie, initialisé avec les paramètres du modèle livré
+        fits = _run_fits(executor, [
+            (category, (series[category], *baselines[category], current_params[category], full_iter, holdout))
+            for category in categories])
+        warm = {category: fits[category].get('params') or current_params[category] for category in categories}
+        
+        # 2. Premier passage court de tous les candidats (paramètres initiaux de l'ordre actuel)
+        grid = list(iter_sarima_orders(max_p, max_q, max_P, max_Q, d_values, D_values))
+        tasks, pruned = [], {category: 0 for category in categories}
+        for category in categories:
+            for order, seasonal_order in grid:
+                if (order, seasonal_order) == baselines[category]:
+                    continue
+                if not sarima_has_enough_data(len(series[category]), order, seasonal_order, holdout):
+                    pruned[category] += 1
+                    continue
+                tasks.append(((category, order, seasonal_order),
+                              (series[category], order, seasonal_order, warm[category], quick_iter, holdout)))
+        quick = _run_fits(executor, tasks)
+        
+        # 3. Élagage : seuls les meilleurs candidats du premier passage sont ajustés complètement
+        finalists = []
+        for category in categories:
+            candidates = sorted((fit for (cat, _, _), fit in quick.items() if cat == category and 'error' not in fit),
+                                key=_rank_key(metric))
+            pruned[category] += len(candidates) - min(keep, len(candidates))
+            pruned[category] += sum(1 for (cat, _, _), fit in quick.items() if cat == category and 'error' in fit)
+            finalists += [((category, fit['order'], fit['seasonal_order']),
+                           (series[category], fit['order'], fit['seasonal_order'], fit['params'], full_iter, holdout))
+                          for fit in candidates[:keep]]
+        full = _run_fits(executor, finalists)
+        
+        # 4. Choix du meilleur modèle (ordre actuel compris) et ajustement final sur toute la série
+        chosen = {}
+        for category in categories:
+            candidates = [fit for (cat, _, _), fit in full.items() if cat == category and 'error' not in fit]
+            if 'error' not in fits[category]:
+                candidates.append(fits[category])
+            # Préférer les ajustements dont l'optimisation a convergé
+            candidates = [fit for fit in candidates if fit['converged']] or candidates
+            if not candidates:
+                print(f"{category:<18}aucun candidat n'a pu être ajusté : {fits[category].get('error')}")
+                continue
+            chosen[category] = min(candidates, key=_rank_key(metric))
+        
+        final = _run_fits(executor, [
+            (category, (series[category], fit['order'], fit['seasonal_order'], fit['params'], full_iter, 0,
+                        os.path.join(version_dir, CATEGORY_MODELS[category])))
+            for category, fit in chosen.items()])
+    
+    manifest = {
+        'version': version,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'data_version': get_data_version(),
+        'metric': metric,
+        'holdout': holdout,
+        'grid': {'max_p': max_p, 'max_q': max_q, 'max_P': max_P, 'max_Q': max_Q,
+                 'd': list(d_values), 'D': list(D_values), 'quick_iter': quick_iter, 'keep': keep},
+        'seconds': round(time.perf_counter() - started, 1),
+        'models': {}
+    }
+    print(f"\n{'Catégorie':<18}{'ordre':>24}{'AIC':>10}{'RMSE val.':>11}{'essais':>8}{'élagués':>9}")
+    for category, fit in chosen.items():
+        result = final[category]
+        if 'error' in result:
+            print(f"{category:<18}échec de l'ajustement final : {result['error']}")
+            continue
+        order_label = f"{fit['order']}{fit['seasonal_order']}"
+        tried = 1 + sum(1 for (cat, _, _) in quick if cat == category)
+        rmse = fit.get('holdout_rmse')
+        print(f"{category:<18}{order_label:>24}{result['aic']:>10.2f}{(f'{rmse:.3f}' if rmse is not None else '-'):>11}"
+              f"{tried:>8}{pruned[category]:>9}")
+        manifest['models'][category] = {
+            'file': CATEGORY_MODELS[category],
+            'order': list(fit['order']),
+            'seasonal_order': list(fit['seasonal_order']),
+            'aic': result['aic'],
+            'bic': result['bic'],
+            'holdout_rmse': rmse,
+            'converged': result['converged'],
+            'nobs': len(series[category]),
+            'last_observed': format_quarter_index(quarter_index(DATA_START_YEAR, DATA_START_QUARTER)
+                                                  + len(series[category]) - 1),
+            'candidates_tried': tried,
+            'candidates_pruned': pruned[category]
+        }
+    
+    # Version complète : les modèles non réentraînés sont repris tels quels
+    manifest['unchanged'] = []
+    for category in CATEGORY_MODELS:
+        if category not in manifest['models'] and os.path.exists(get_model_file(category)):
+            shutil.copyfile(get_model_file(category), os.path.join(version_dir, CATEGORY_MODELS[category]))
+            manifest['unchanged'].append(category)
+    
+    with open(os.path.join(version_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    print(f"\nVersion {version_dir} écrite en {manifest['seconds']} s (servir avec MODEL_DIR={version_dir})")
+    
+    if install:
+        for category in manifest['models']:
+            install_model_file(os.path.join(version_dir, CATEGORY_MODELS[category]), get_model_file(category))
+        print(f"{len(manifest['models'])} modèle(s) installé(s)")
+
+
 if __name__ == '__main__':
+    if not app.config['WARMUP_ON_START']:
+        build_forecast_table()
     app.run(debug=True, host='0.0.0.0', port=5000)
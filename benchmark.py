@@ -0,0 +1,266 @@
+"""
+Banc d'essai des performances de l'application (hors ligne, sur les modèles et le classeur livrés).
+
+Mesures :
+- import de app.py et démarrage (import + chargement des données et table de prévisions), dans un sous-processus
+- temps de désérialisation et mémoire résidente de chaque sarima_*.pkl
+- latence de /predict pour un horizon court et pour T4 2050 (client de test Flask)
+- temps de rendu de chaque figure du tableau de bord, par format (png, svg, svgz, webp) et résolution,
+  et de la page /dashboard complète (images ou séries JSON)
+
+Utilisation :
+    python benchmark.py --output bench.json
+    python benchmark.py --baseline bench.json --threshold 0.2   # code de sortie 1 en cas de régression
+"""
+import argparse
+import base64
+import json
+import os
+import pickle
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+# Environnement de mesure reproductible : pas de préchargement ni de cache disque des figures
+os.environ['WARMUP_ON_START'] = '0'
+os.environ.pop('FIGURE_CACHE_DIR', None)
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def summarize(samples):
+    """Statistiques (ms) d'une série de durées en secondes"""
+    ms = sorted(sample * 1000 for sample in samples)
+    return {
+        'n': len(ms),
+        'min_ms': round(ms[0], 3),
+        'median_ms': round(statistics.median(ms), 3),
+        'mean_ms': round(statistics.fmean(ms), 3),
+        'p95_ms': round(ms[min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))], 3),
+        'max_ms': round(ms[-1], 3)
+    }
+
+
+def timed(func, repeat, *args, **kwargs):
+    """Exécute func `repeat` fois et retourne les statistiques de durée"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def rss_kib():
+    """Mémoire résidente du processus (Kio), lue dans /proc/self/status"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_in_subprocess(code, repeat):
+    """Exécute `code` dans un nouvel interpréteur ; le code imprime une durée en secondes"""
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True,
+                                capture_output=True, text=True).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return summarize(samples)
+
+
+def bench_startup(repeat):
+    """Temps d'import de app.py et de démarrage complet (données + table de prévisions)"""
+    import_code = ("import time; start = time.perf_counter(); import app; "
+                   "print(time.perf_counter() - start)")
+    startup_code = ("import time; start = time.perf_counter(); import app; app.load_data(); "
+                    "app.build_forecast_table(); print(time.perf_counter() - start)")
+    return {
+        'startup.import': run_in_subprocess(import_code, repeat),
+        'startup.full': run_in_subprocess(startup_code, repeat)
+    }
+
+
+def bench_models(app_module, repeat):
+    """Temps de désérialisation et mémoire résidente ajoutée par chaque modèle"""
+    results = {}
+    kept = []
+    for category in app_module.CATEGORY_MODELS:
+        path = os.path.join(ROOT, app_module.get_model_file(category))
+        if not os.path.exists(path):
+            continue
+
+        def load():
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+
+        before = rss_kib()
+        kept.append(load())
+        stats = timed(load, repeat)
+        stats['rss_kib'] = rss_kib() - before
+        stats['file_bytes'] = os.path.getsize(path)
+        results[f'model.unpickle.{category}'] = stats
+    return results
+
+
+def bench_predict(app_module, repeat):
+    """Latence de /predict (horizon court et T4 2050) pour chaque moteur, modèles déjà chargés"""
+    client = app_module.app.test_client()
+    category = next(iter(app_module.CATEGORY_MODELS))
+    year, quarter = app_module.quarter_from_index(app_module.get_forecast_origin(category) + 1)
+    horizons = {'short': (year, quarter), '2050': (app_module.FORECAST_TABLE_LAST_YEAR, 4)}
+
+    results = {}
+    for engine in app_module.FORECAST_ENGINES:
+        for label, (year, quarter) in horizons.items():
+            payload = {'category': category, 'year': year, 'quarter': quarter, 'engine': engine}
+
+            def post():
+                response = client.post('/predict', json=payload)
+                if response.status_code != 200:
+                    raise RuntimeError(f'/predict a échoué : {response.get_json()}')
+
+            post()  # Chargement du modèle hors mesure
+            results[f'predict.{engine}.{label}'] = timed(post, repeat)
+    return results
+
+
+def bench_figures(app_module, repeat):
+    """Temps de rendu (sans cache) de chaque figure du tableau de bord"""
+    results = {}
+    for section, name, func, args in app_module.get_dashboard_jobs(app_module.load_data()):
+        render = func.__wrapped__  # Fonction generate_* sans le cache de figures
+        render(*args)  # Premier rendu (chargements) hors mesure
+        label = args[0] if args else section
+        results[f'figure.{func.kind}.{label}'] = timed(render, repeat, *args)
+
+    # Formats et résolutions de sortie, sur la figure la plus chargée (comparaison en lignes)
+    render = app_module.generate_comparison_line_plot.__wrapped__
+    for fmt in app_module.PLOT_MIMETYPES:
+        for dpi in (app_module.PLOT_DEFAULT_DPI, 2 * app_module.PLOT_DEFAULT_DPI):
+            stats = timed(render, repeat, fmt=fmt, dpi=dpi)
+            stats['bytes'] = len(base64.b64decode(render(fmt=fmt, dpi=dpi)))
+            results[f'figure.format.{fmt}.{dpi}dpi'] = stats
+    return results
+
+
+def bench_dashboard(app_module, repeat):
+    """Page /dashboard complète avec images intégrées, cache de figures vide puis rempli"""
+    client = app_module.app.test_client()
+    app_module.app.config['DASHBOARD_IMAGE_MODE'] = 'inline'
+
+    def get():
+        response = client.get('/dashboard')
+        if response.status_code != 200:
+            raise RuntimeError(f'/dashboard a échoué ({response.status_code})')
+
+    def get_cold():
+        app_module.clear_figure_cache()
+        get()
+
+    results = {
+        'dashboard.inline.cold': timed(get_cold, repeat),
+        'dashboard.inline.warm': timed(get, repeat)
+    }
+
+    app_module.app.config['DASHBOARD_IMAGE_MODE'] = 'url'
+    results['dashboard.url'] = timed(get, repeat)
+
+    def get_client():
+        # Page en mode 'client' et séries JSON de toutes les catégories dessinées par le navigateur
+        response = client.get('/dashboard?mode=client')
+        if response.status_code != 200:
+            raise RuntimeError(f'/dashboard?mode=client a échoué ({response.status_code})')
+        for category in app_module.CATEGORY_MODELS:
+            client.get(f'/api/series/{category}')
+
+    results['dashboard.client'] = timed(get_client, repeat)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Compare les médianes à une référence ; retourne la liste des régressions"""
+    regressions = []
+    print(f"{'Mesure':<48}{'référence':>12}{'actuel':>12}{'écart':>9}")
+    for name, stats in results.items():
+        reference = baseline.get('results', {}).get(name)
+        if not reference or not reference.get('median_ms'):
+            continue
+        ratio = stats['median_ms'] / reference['median_ms'] - 1
+        flag = ''
+        if ratio > threshold:
+            regressions.append(name)
+            flag = '  RÉGRESSION'
+        print(f"{name:<48}{reference['median_ms']:>12.2f}{stats['median_ms']:>12.2f}{ratio:>+9.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc d'essai des performances de l'application")
+    parser.add_argument('--output', '-o', help='Fichier JSON des résultats (défaut : sortie standard)')
+    parser.add_argument('--baseline', help='Résultats de référence (JSON) à comparer')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Écart relatif de la médiane au-delà duquel une mesure est une régression (défaut : 0.2)')
+    parser.add_argument('--repeat', type=int, default=20, help='Répétitions par mesure (défaut : 20)')
+    parser.add_argument('--startup-repeat', type=int, default=3, help='Répétitions des mesures de démarrage (défaut : 3)')
+    parser.add_argument('--only', nargs='+', choices=['startup', 'models', 'predict', 'figures', 'dashboard'],
+                        help='Ne lancer que certains groupes de mesures')
+    args = parser.parse_args()
+
+    groups = args.only or ['startup', 'models', 'predict', 'figures', 'dashboard']
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+
+    results = {}
+    if 'startup' in groups:
+        results.update(bench_startup(args.startup_repeat))
+
+    import app as app_module
+    if 'models' in groups:
+        results.update(bench_models(app_module, args.repeat))
+    if 'predict' in groups:
+        results.update(bench_predict(app_module, args.repeat))
+    if 'figures' in groups:
+        results.update(bench_figures(app_module, max(1, args.repeat // 4)))
+    if 'dashboard' in groups:
+        results.update(bench_dashboard(app_module, max(1, args.repeat // 10)))
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': args.repeat,
+            'config': {key: app_module.app.config[key] for key in
+                       ('MODEL_FORMAT', 'FORECAST_ENGINE', 'DASHBOARD_WORKERS', 'DATA_CACHE_DIR')}
+        },
+        'results': results
+    }
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} régression(s) au-delà de {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+"""
+Point d'entrée de production en pré-fork.
+
+Le processus maître charge une seule fois le classeur, les modèles, la table de prévisions et les valeurs
+ajustées, gèle ces objets (gc.freeze) puis crée les processus de service par fork : les pages mémoire
+des objets chargés sont partagées en copie sur écriture au lieu d'être dupliquées dans chaque processus.
+Tous les processus acceptent les connexions sur la même socket d'écoute, ouverte par le maître.
+
+Le maître relance les processus de service qui s'arrêtent et affiche périodiquement (et sur SIGUSR1)
+la mémoire de chaque processus : pages propres (unique), partagées (shared) et PSS.
+
+Utilisation :
+    python serve.py --workers 4 --port 8000
+    python serve.py --workers 4 --no-preload    # comparaison : chaque processus charge ses propres objets
+"""
+import argparse
+import gc
+import os
+import signal
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Les tâches d'arrière-plan de app.py (préchargement, surveillance des fichiers) ne doivent pas
+# démarrer dans le maître : aucun thread ne doit tourner au moment du fork
+os.environ['PREFORK'] = '1'
+
+
+def preload(app_module):
+    """Charge dans le processus courant tout ce que les requêtes utilisent (données, modèles, prévisions)"""
+    app_module.run_warmup()
+    for category in app_module.CATEGORY_MODELS:
+        try:
+            app_module.get_forecast_origin(category)
+            app_module.get_fitted_series(category)
+            if app_module.app.config['FORECAST_ENGINE'] == 'numpy':
+                app_module.get_engine_state(category)
+        except Exception as e:
+            print(f"Erreur de préchargement pour {category}: {str(e)}")
+
+
+def format_mib(value):
+    """Octets en Mio (une décimale)"""
+    return f'{value / (1024 * 1024):.1f}'
+
+
+def memory_report(app_module, workers):
+    """Affiche la mémoire du maître et de chaque processus de service"""
+    rows = [('maître', os.getpid())] + [(f'service {slot}', pid) for slot, pid in sorted(workers.items())]
+    print(f"{'Processus':<14}{'pid':>8}{'RSS':>10}{'PSS':>10}{'unique':>10}{'partagée':>10}  (Mio)")
+    total_pss = 0
+    for label, pid in rows:
+        memory = app_module.read_process_memory(pid)
+        if memory is None:
+            print(f'{label:<14}{pid:>8}  mémoire indisponible')
+            continue
+        total_pss += memory['pss']
+        print(f"{label:<14}{pid:>8}{format_mib(memory['rss']):>10}{format_mib(memory['pss']):>10}"
+              f"{format_mib(memory['unique']):>10}{format_mib(memory['shared']):>10}")
+    print(f"Total (somme des PSS) : {format_mib(total_pss)} Mio")
+    sys.stdout.flush()
+
+
+def run_worker(app_module, server, load):
+    """Corps d'un processus de service : ne retourne pas"""
+    # SIGINT (Ctrl+C) et SIGUSR1 sont traités par le maître
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+
+    # Arrêt progressif sur SIGTERM (envoyé par le maître) : plus de nouvelle connexion, les requêtes en
+    # cours se terminent. shutdown() attend la sortie de serve_forever : il est appelé depuis un autre thread
+    def stop(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    # Threads de requête non démons : server_close() attend la fin des requêtes en cours
+    server.daemon_threads = False
+    status = 0
+    try:
+        if load:
+            preload(app_module)
+        app_module.start_background_tasks()
+        server.serve_forever()
+        server.server_close()
+    except Exception as e:
+        print(f"Erreur du processus de service {os.getpid()}: {str(e)}")
+        status = 1
+    finally:
+        sys.stdout.flush()
+        os._exit(status)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service de l'application en pré-fork")
+    parser.add_argument('--host', default='0.0.0.0', help="Adresse d'écoute (défaut : 0.0.0.0)")
+    parser.add_argument('--port', type=int, default=8000, help="Port d'écoute (défaut : 8000)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Nombre de processus de service (défaut : nombre de processeurs)')
+    parser.add_argument('--no-threads', action='store_true',
+                        help='Une requête à la fois par processus (défaut : un thread par requête)')
+    parser.add_argument('--no-preload', action='store_true',
+                        help='Ne pas charger dans le maître : chaque processus charge ses propres objets')
+    parser.add_argument('--no-freeze', action='store_true', help='Ne pas geler les objets chargés (gc.freeze)')
+    parser.add_argument('--memory-report', type=float, default=60,
+                        help='Intervalle (secondes) du rapport mémoire (défaut : 60 ; 0 : sur SIGUSR1 uniquement)')
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    import app as app_module
+    from werkzeug.serving import make_server
+
+    start = time.perf_counter()
+    if not args.no_preload:
+        preload(app_module)
+        print(f"Préchargement terminé en {time.perf_counter() - start:.2f} s")
+
+    # Magasin des séries publié avant le fork : tous les processus de service mappent le même fichier
+    store_path = app_module.app.config['SERIES_STORE']
+    if store_path:
+        count = app_module.write_series_store(store_path)
+        print(f"Magasin des séries publié : {store_path} ({count} catégories)")
+
+    # Objets chargés déplacés dans la génération permanente : le ramasse-miettes des processus de
+    # service ne les parcourt plus et n'écrit donc pas dans leurs pages partagées
+    gc.collect()
+    if not args.no_freeze:
+        gc.freeze()
+        print(f"{gc.get_freeze_count()} objets gelés")
+
+    server = make_server(args.host, args.port, app_module.app, threaded=not args.no_threads)
+    print(f"Écoute sur http://{args.host}:{args.port} avec {args.workers} processus de service")
+    sys.stdout.flush()
+
+    workers = {}
+    state = {'running': True, 'report': False}
+
+    def spawn(slot):
+        pid = os.fork()
+        if pid == 0:
+            run_worker(app_module, server, args.no_preload)
+        workers[slot] = pid
+
+    def stop(signum, frame):
+        state['running'] = False
+
+    def request_report(signum, frame):
+        state['report'] = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGUSR1, request_report)
+
+    for slot in range(max(1, args.workers)):
+        spawn(slot)
+
+    next_report = time.monotonic() + args.memory_report if args.memory_report > 0 else None
+    try:
+        while state['running']:
+            # Relancer les processus de service arrêtés
+            for slot, pid in list(workers.items()):
+                try:
+                    done, status = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    done, status = pid, 0
+                if done and state['running']:
+                    print(f"Processus de service {pid} arrêté (statut {status}), relance")
+                    spawn(slot)
+
+            if state['report'] or (next_report is not None and time.monotonic() >= next_report):
+                state['report'] = False
+                memory_report(app_module, workers)
+                if next_report is not None:
+                    next_report = time.monotonic() + args.memory_report
+            time.sleep(0.5)
+    finally:
+        for pid in workers.values():
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in workers.values():
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        server.server_close()
+        print('Arrêt du service')
+
+
+if __name__ == '__main__':
+    main()